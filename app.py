@@ -1,9 +1,17 @@
+import time
+from datetime import datetime
+
 import streamlit as st
 import pandas as pd
 
 from src.utils.ui_components import init_ui, show_qr_entry, show_settings_interface
-from src.core.db_handler import DatabaseHandler
-from src.core.qr_handler import generate_download_link, process_upload_data
+from src.core.db_handler import DatabaseHandler, entry_from_record
+from src.core.archive_handler import ArchiveHandler
+from src.core.job_queue import ACTIVE_STATUSES, JobQueue
+from src.core.label_sheet import LABEL_TEMPLATES, LabelSheetComposer
+from src.core.payload_templates import get_sender_profiles
+from src.core.qr_handler import generate_download_link
+from src.core.qr_verifier import verify_entries
 from src.utils.settings_handler import load_settings, save_settings, validate_sender_settings
 
 # Initialize UI
@@ -16,6 +24,28 @@ except Exception as e:
     st.error(f"Error initializing database: {e}")
     db = None
 
+JOB_REFRESH_SECONDS = 1.5
+
+@st.cache_resource
+def get_job_queue():
+    """One job queue per server process, shared by all sessions"""
+    settings = load_settings().get("upload_jobs", {})
+    return JobQueue(DatabaseHandler(), settings.get("workers", 2), settings.get("chunk_size", 50))
+
+def show_label_sheet_download(entries_source, key):
+    """Offer a printable label-sheet PDF for the given entries"""
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        template_name = st.selectbox("Label template", list(LABEL_TEMPLATES.keys()), key=f"{key}_template")
+    with col2:
+        if st.button("🏷️ Build label sheet", key=f"{key}_build"):
+            composer = LabelSheetComposer(LABEL_TEMPLATES[template_name])
+            with st.spinner("Composing label sheet..."):
+                st.session_state[f"{key}_pdf"] = composer.pdf_bytes(entries_source())
+    if st.session_state.get(f"{key}_pdf"):
+        st.download_button("Download label sheet (PDF)", st.session_state[f"{key}_pdf"],
+                           file_name="label_sheet.pdf", mime="application/pdf", key=f"{key}_download")
+
 # Initialize session state
 if 'active_tab' not in st.session_state:
     st.session_state.active_tab = 'generate'
@@ -37,8 +67,15 @@ elif selected_tab == "Settings":
 if st.session_state.active_tab == 'generate':
     st.markdown("## Generate QR Codes")
     
-    # Load sender settings
-    sender_settings = load_settings()["sender"]
+    # Load sender settings, letting the operator pick a named profile if configured
+    sender_profiles = get_sender_profiles(load_settings())
+    sender_settings = sender_profiles.get("default", load_settings()["sender"])
+    profile_name = "default"
+    if len(sender_profiles) > 1:
+        profile_name = st.selectbox("Sender profile", list(sender_profiles.keys()))
+        sender_settings = sender_profiles[profile_name]
+    
+    job_queue = get_job_queue()
     
     # Check if sender settings are configured
     if not validate_sender_settings({"sender": sender_settings}):
@@ -64,27 +101,147 @@ if st.session_state.active_tab == 'generate':
                 st.error("Missing required column: Artist Name")
                 st.stop()
             
-            # Process entries
-            with st.spinner(f"Processing {len(df)} entries..."):
-                entries = process_upload_data(df, sender_settings)
-                
-                # Save entries to database
-                for entry in entries:
-                    db.save_entry(entry)
-                
-                # Display success message and newly generated QR codes
-                st.success(f"Successfully processed {len(df)} entries!")
-                st.markdown("## Generated QR Codes")
-                
-                # Display only the newly generated QR codes
-                for entry in entries:
-                    show_qr_entry(entry, generate_download_link)
+            # Queue the upload; the same file is only submitted once per session
+            upload_key = f"{uploaded_file.name}:{uploaded_file.size}:{profile_name}"
+            if st.session_state.get("submitted_upload") == upload_key:
+                st.info(f"{uploaded_file.name} has been queued. Progress is shown below.")
+            elif st.button(f"▶️ Process {len(df)} entries", type="primary"):
+                st.session_state.current_job = job_queue.submit(
+                    df, sender_settings, load_settings().get("qr_budget"), uploaded_file.name
+                )
+                st.session_state.submitted_upload = upload_key
+                st.rerun()
                     
         except Exception as e:
             st.error(f"Error processing file: {str(e)}")
+    
+    # Upload jobs run in the background; this panel only reads their state
+    jobs = job_queue.list_jobs()
+    if jobs:
+        st.markdown("## Upload Jobs")
+        for job in jobs:
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                progress = job['rows_processed'] / job['total_rows'] if job['total_rows'] else 1.0
+                st.progress(progress, text=(
+                    f"{job['filename'] or job['job_id']} — {job['status']} • "
+                    f"{job['rows_processed']}/{job['total_rows']} rows • New: {job['new_rows']} • "
+                    f"Changed: {job['changed_rows']} • Unchanged: {job['unchanged_rows']}"
+                    + (f" • Failed: {job['failed_rows']}" if job['failed_rows'] else "")
+                ))
+                if job['status'] == 'failed':
+                    st.error(f"Job failed: {job['error']}")
+            with col2:
+                if job['status'] in ACTIVE_STATUSES:
+                    if job['cancel_requested']:
+                        st.caption("Cancelling...")
+                    elif st.button("Cancel", key=f"cancel_{job['job_id']}"):
+                        job_queue.cancel(job['job_id'])
+                        st.rerun()
+                elif st.button("Show", key=f"show_{job['job_id']}"):
+                    st.session_state.current_job = job['job_id']
+        
+        active = any(job['status'] in ACTIVE_STATUSES for job in jobs)
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            st.button("🔄 Refresh")
+        with col2:
+            auto_refresh = st.checkbox("Auto-refresh while jobs run", value=True)
+        
+        # Results of the selected job, including chunks already saved while it runs
+        job = job_queue.get_job(st.session_state.get("current_job", "")) if "current_job" in st.session_state else None
+        if job is not None:
+            # QR size budget report for the codes this job encoded
+            plan_stats = job['plan_summary']
+            if plan_stats:
+                versions = ", ".join(f"v{version}: {count}" for version, count in plan_stats['versions'].items())
+                st.caption(f"QR versions — {versions} • EC levels: {plan_stats['error_correction']}")
+            if job['shortened_rows']:
+                st.warning(f"{job['shortened_rows']} addresses were shortened to fit the QR size budget.")
+            if job['over_budget_rows']:
+                over_budget = plan_stats['over_budget_names'] if plan_stats else []
+                st.warning(f"{job['over_budget_rows']} codes exceed the QR size budget"
+                           + (f": {', '.join(over_budget[:20])}" if over_budget else "."))
+            
+            job_filters = {"upload_id": job['job_id']}
+            show_label_sheet_download(lambda: db.iter_entries(filters=job_filters), f"job_{job['job_id']}_labels")
+            
+            # Round-trip check that every generated code decodes back to its payload
+            if job['status'] == 'done' and st.button("🔍 Verify codes", key=f"verify_{job['job_id']}"):
+                progress_bar = st.progress(0.0)
+                total = max(job['new_rows'] + job['changed_rows'], 1)
+                try:
+                    report = verify_entries(db.iter_entries(filters=job_filters),
+                                            progress=lambda checked: progress_bar.progress(min(checked / total, 1.0)))
+                    if report['failures']:
+                        st.error(f"{len(report['failures'])} of {report['checked']} codes failed to round-trip:")
+                        st.dataframe(pd.DataFrame(report['failures']))
+                    else:
+                        st.success(f"All {report['checked']} codes decode to their payload "
+                                   f"(median decode {report['decode_ms']['p50']} ms).")
+                except Exception as e:
+                    st.error(f"Error verifying codes: {str(e)}")
+            st.markdown("## Generated QR Codes")
+            
+            # Display only the QR codes this job generated or updated
+            for record in db.iter_entries(filters=job_filters):
+                show_qr_entry(entry_from_record(record), generate_download_link)
+        
+        if active and auto_refresh:
+            time.sleep(JOB_REFRESH_SECONDS)
+            st.rerun()
 
 elif st.session_state.active_tab == 'history':
     st.markdown("## QR Code History")
+    
+    # Counts come from the trigger-maintained qr_stats table, not a scan of history
+    with st.expander("📊 Statistics", expanded=True):
+        stats = db.get_stats()
+        by_day = dict(stats['by_day'])
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Stored codes", stats['total'])
+        col2.metric("Generated today", by_day.get(datetime.now().strftime('%Y-%m-%d'), 0))
+        col3.metric(f"Last {len(by_day)} active days", sum(by_day.values()))
+        if by_day:
+            st.bar_chart(pd.DataFrame({"Codes": by_day}))
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**By sender**")
+            st.dataframe(pd.DataFrame(stats['by_sender'], columns=["Sender", "Codes"]), hide_index=True)
+        with col2:
+            st.markdown("**By upload**")
+            st.dataframe(pd.DataFrame(stats['by_upload'], columns=["Upload", "Day", "Codes"]), hide_index=True)
+    
+    # Retention and archive search
+    with st.expander("🗄️ Archive"):
+        retention = load_settings().get("retention", {})
+        archive = ArchiveHandler(db.db_path, retention.get("archive_path", "qrcodes_archive.db"))
+        st.caption(
+            f"Keep {retention.get('max_age_days', '∞')} days / {retention.get('max_rows', '∞')} rows. "
+            f"{archive.count()} entries archived."
+        )
+        if st.button("Apply retention now"):
+            summary = archive.apply_retention(
+                retention.get("max_age_days"),
+                retention.get("max_rows"),
+                retention.get("batch_size", 500)
+            )
+            st.success(f"Archived {summary['by_age'] + summary['by_count']} entries.")
+        
+        if not archive.incremental_vacuum_enabled():
+            st.caption("This database predates incremental vacuum, so archiving does not shrink the file.")
+            if st.button("Convert database (one-time full VACUUM)"):
+                with st.spinner("Rewriting database..."):
+                    if archive.enable_incremental_vacuum():
+                        st.success("Archived space will now be returned to disk.")
+                    else:
+                        st.error("Error converting database. Please try again when no uploads are running.")
+        
+        archive_query = st.text_input("Search archive (artist, reference ID or address)")
+        if archive_query:
+            for entry in archive.search(archive_query):
+                show_qr_entry(entry, generate_download_link)
+    
     entries = db.get_all_entries()
     
     if not entries:
@@ -97,6 +254,9 @@ elif st.session_state.active_tab == 'history':
             else:
                 st.error("Error clearing data. Please try again.")
         
+        with st.expander("🏷️ Label sheets"):
+            show_label_sheet_download(lambda: db.iter_entries(newest_first=True), "history_labels")
+        
         st.markdown("## Generated QR Codes", help=None)
         
         # Display each QR code entry
@@ -0,0 +1,55 @@
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+
+from src.core.db_handler import DatabaseHandler
+from src.core.id_generator import new_reference_id
+
+SENDER = (1, 'sample', 'Sender', 'Address', 'City', 'State', '00000')
+ROW = (SENDER[0], 'Artist', '555-0100', '1 Sample Street', 'iVBORw0KGgo=')
+
+def fill(db_path: str, id_factory, rows: int, batch_size: int) -> float:
+    """Insert ``rows`` rows in batches and return rows per second."""
+    conn = sqlite3.connect(db_path)
+    conn.execute('INSERT OR IGNORE INTO senders VALUES (?, ?, ?, ?, ?, ?, ?)', SENDER)
+    start = time.perf_counter()
+    for offset in range(0, rows, batch_size):
+        batch = [
+            (id_factory(),) + ROW + ('2024-01-01 00:00:00', None)
+            for _ in range(min(batch_size, rows - offset))
+        ]
+        conn.executemany('''
+            INSERT OR IGNORE INTO qr_codes (
+                reference_id, sender_id, artist_name, phone, address, qr_code, timestamp, content_hash
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', batch)
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return rows / elapsed
+
+def main():
+    """Compare insert throughput of random uuid4 prefixes vs time-ordered reference IDs."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--rows', type=int, default=500000, help="rows to insert per run")
+    parser.add_argument('--batch-size', type=int, default=1000, help="rows per transaction")
+    args = parser.parse_args()
+
+    generators = {
+        'uuid4[:8]': lambda: str(uuid.uuid4())[:8],
+        'time-ordered': new_reference_id,
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, id_factory in generators.items():
+            db_path = os.path.join(tmp, f"{name}.db")
+            DatabaseHandler(db_path)
+            rate = fill(db_path, id_factory, args.rows, args.batch_size)
+            count = sqlite3.connect(db_path).execute('SELECT COUNT(*) FROM qr_codes').fetchone()[0]
+            print(f"{name:>14}: {rate:10.0f} rows/s, {args.rows - count} collisions, "
+                  f"{os.path.getsize(db_path) / 1e6:.1f} MB")
+
+if __name__ == '__main__':
+    main()
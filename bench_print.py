@@ -0,0 +1,51 @@
+import argparse
+import json
+import logging
+
+import scan_qr
+from src.core.virtual_printer import create_virtual_devices, run_print_benchmark
+
+SAMPLE_RESULT = (
+    "📤 Sender Information\n"
+    "Name: Default Name\n"
+    "Address: Default Address\n"
+    "Location: Default City, Default State 00000\n"
+    "\n"
+    "🎨 Artist Information\n"
+    "Name: Sample Artist\n"
+    "Phone: 555-0100\n"
+    "Address: 1 Sample Street, Sample City, CA, 90000, USA"
+)
+
+def main():
+    """Measure print_qr_result throughput against virtual ESC/POS printers."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--jobs', type=int, default=200, help="number of receipts to print")
+    parser.add_argument('--concurrency', type=int, default=4, help="simultaneous print requests")
+    parser.add_argument('--printers', type=int, default=1, help="number of virtual printers in the pool")
+    parser.add_argument('--latency-ms', type=float, default=5.0, help="simulated latency per USB write")
+    parser.add_argument('--bytes-per-second', type=int, default=None, help="simulated transfer rate")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="chance of a failed USB write")
+    parser.add_argument('--output', default=None, help="append the captured ESC/POS stream to this file")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    config = {
+        'count': args.printers,
+        'latency_ms': args.latency_ms,
+        'bytes_per_second': args.bytes_per_second,
+        'error_rate': args.error_rate,
+        'output': args.output,
+        'seed': 0
+    }
+    scan_qr.printer_pool.retry_interval = 0.5
+    for device in create_virtual_devices(config):
+        scan_qr.printer_pool.add(device)
+
+    result = run_print_benchmark(scan_qr.print_qr_result, [SAMPLE_RESULT] * args.jobs, args.concurrency)
+    result['printers'] = scan_qr.printer_pool.stats()
+    print(json.dumps(result, indent=2))
+
+if __name__ == '__main__':
+    main()
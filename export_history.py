@@ -0,0 +1,41 @@
+import argparse
+import time
+
+from src.core.db_handler import DatabaseHandler
+from src.core.history_export import EXPORT_BATCH_SIZE, export_history, import_history
+
+def main():
+    """Export QR code history to Parquet/Arrow files, or import such a file back."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--db', default='qrcodes.db', help="database to export from or import into")
+    parser.add_argument('--batch-size', type=int, default=EXPORT_BATCH_SIZE, help="rows per row group / batch")
+    parser.add_argument('--format', choices=['parquet', 'arrow'], help="file format (default: from extension)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export_cmd = commands.add_parser('export', help="write history to a .parquet or .arrow file")
+    export_cmd.add_argument('path')
+    export_cmd.add_argument('--images', action='store_true', help="include QR images (needed to import later)")
+    export_cmd.add_argument('--since', help="only codes generated at or after this timestamp")
+    export_cmd.add_argument('--until', help="only codes generated before this timestamp")
+    export_cmd.add_argument('--upload-id', help="only codes from this upload job")
+
+    import_cmd = commands.add_parser('import', help="load an exported file into the database")
+    import_cmd.add_argument('path')
+    import_cmd.add_argument('--replace', action='store_true',
+                            help="replace all history with the file instead of merging")
+    args = parser.parse_args()
+
+    db = DatabaseHandler(args.db)
+    start = time.perf_counter()
+    if args.command == 'export':
+        filters = {key: value for key, value in
+                   (('since', args.since), ('until', args.until), ('upload_id', args.upload_id)) if value}
+        rows = export_history(db, args.path, args.format, args.images, filters, args.batch_size)
+        print(f"Exported {rows} entries to {args.path} in {time.perf_counter() - start:.1f} s")
+    else:
+        counts = import_history(db, args.path, args.format, args.replace, args.batch_size)
+        print(f"Imported {counts['inserted']} of {counts['read']} entries from {args.path} "
+              f"({counts['skipped']} already stored) in {time.perf_counter() - start:.1f} s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from src.core.payload_templates import compile_template
+
+FIRST_NAMES = ['Ana', 'Ben', 'Chloé', 'Dmitri', 'Eun-ji', 'Farah', 'Gus', 'Hiro', 'Inés', 'Jon']
+LAST_NAMES = ['Alvarez', "O'Neil", 'Brook', 'Nakamura', 'Søren', 'Okafor', 'Li', 'Smith-Jones']
+STREETS = ['Main St', 'Oak Ave', 'Harbor Blvd', 'Calle Real', 'Rue de la Paix', '5th Ave, Apt 12B']
+CITIES = [('Portland', 'OR', '97201'), ('Austin', 'TX', '73301'), ('Toronto', 'ON', 'M5V 2T6'),
+          ('Lyon', '', '69002'), ('Brooklyn', 'NY', '11201')]
+
+SENDER = {
+    'name': 'Load Test Gallery',
+    'address': '100 Test Way',
+    'city': 'Testville',
+    'state': 'CA',
+    'zip': '90000'
+}
+
+def make_payload(rng: random.Random) -> str:
+    """Build a valid payload in the create_qr_content format."""
+    city, state, zip_code = rng.choice(CITIES)
+    address = ', '.join(part for part in [f"{rng.randint(1, 9999)} {rng.choice(STREETS)}", city, state,
+                                          zip_code, rng.choice(['USA', 'Canada', 'France', ''])] if part)
+    phone = rng.choice(['', f"555-{rng.randint(0, 9999):04d}", f"+1 (555) {rng.randint(100, 999)}-0100"])
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    return compile_template(SENDER).render(name, phone, address)
+
+def make_malformed_payload(rng: random.Random) -> str:
+    """Build one of several broken payloads seen from damaged or foreign labels."""
+    valid = make_payload(rng)
+    kind = rng.choice(['truncated', 'no_sections', 'garbage', 'empty_values', 'huge', 'url'])
+    if kind == 'truncated':
+        return valid[:rng.randint(1, len(valid) - 1)]
+    if kind == 'no_sections':
+        return valid.replace('SR:\n', '').replace('AT:\n', '')
+    if kind == 'garbage':
+        return ''.join(chr(rng.randint(32, 0x2FF)) for _ in range(rng.randint(5, 200)))
+    if kind == 'empty_values':
+        return "SR:\nNM:\nADD:\nCT:\nSTT:\nCD:\n\nAT:\nNM:\nPH:\nADD:"
+    if kind == 'huge':
+        return valid + ' ' + 'x' * 4000
+    return 'https://example.com/not-a-shipping-label'
+
+def percentile(sorted_values: list, pct: float):
+    if not sorted_values:
+        return None
+    index = min(int(len(sorted_values) * pct / 100), len(sorted_values) - 1)
+    return sorted_values[index]
+
+def post_json(url: str, body: dict, timeout: float):
+    request = urllib.request.Request(url, data=json.dumps(body).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.status, json.loads(response.read())
+
+def run_station(station_id: int, args, deadline: float, results: list, lock: threading.Lock):
+    """Simulate one scanning station until the deadline."""
+    rng = random.Random(args.seed + station_id)
+    url = args.url.rstrip('/') + ('/process_qr_batch' if args.batch > 1 else '/process_qr')
+    while time.time() < deadline:
+        count = args.batch if args.batch > 1 else 1
+        payloads = [make_malformed_payload(rng) if rng.random() < args.malformed else make_payload(rng)
+                    for _ in range(count)]
+        body = {'qr_data': payloads if args.batch > 1 else payloads[0]}
+
+        start = time.perf_counter()
+        ok = False
+        try:
+            status, result = post_json(url, body, args.timeout)
+            ok = status == 200 and result.get('success', False)
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except Exception:
+            status = None
+        elapsed = time.perf_counter() - start
+
+        with lock:
+            results.append((time.time(), elapsed, ok, status, count))
+
+        if args.think_ms:
+            time.sleep(rng.expovariate(1000 / args.think_ms))
+
+def sample_queue(args, deadline: float, samples: list):
+    """Poll /printer_stats for print-queue depth over time."""
+    url = args.url.rstrip('/') + '/printer_stats'
+    start = time.time()
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=args.timeout) as response:
+                stats = json.loads(response.read())
+            samples.append({
+                't': round(time.time() - start, 2),
+                'queued': stats.get('print_queue_depth'),
+                'in_flight': stats.get('prints_in_flight')
+            })
+        except Exception:
+            pass
+        time.sleep(args.sample_interval)
+
+def start_local_server(args):
+    """Run scan_qr in this process on a free port with virtual printers."""
+    import logging
+    from werkzeug.serving import make_server
+
+    import scan_qr
+    from src.core.virtual_printer import create_virtual_devices
+
+    logging.getLogger().setLevel(logging.WARNING)
+    for device in create_virtual_devices({'count': args.printers, 'latency_ms': args.print_latency_ms,
+                                          'bytes_per_second': args.bytes_per_second}):
+        scan_qr.printer_pool.add(device)
+
+    server = make_server('127.0.0.1', 0, scan_qr.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    args.url = f"http://127.0.0.1:{server.server_port}"
+    return server
+
+def main():
+    """Drive the scanner service from many simulated stations and report capacity."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--url', default='http://localhost:8000', help="scanner service to test")
+    parser.add_argument('--local', action='store_true',
+                        help="start scan_qr in-process with virtual printers instead of using --url")
+    parser.add_argument('--stations', type=int, default=8, help="concurrent simulated stations")
+    parser.add_argument('--duration', type=float, default=30, help="test length in seconds")
+    parser.add_argument('--think-ms', type=float, default=200, help="mean pause between scans per station")
+    parser.add_argument('--batch', type=int, default=1, help="codes per request (>1 uses /process_qr_batch)")
+    parser.add_argument('--malformed', type=float, default=0.05, help="fraction of malformed payloads")
+    parser.add_argument('--timeout', type=float, default=10, help="HTTP timeout in seconds")
+    parser.add_argument('--sample-interval', type=float, default=0.5, help="queue sampling interval")
+    parser.add_argument('--printers', type=int, default=1, help="virtual printers for --local")
+    parser.add_argument('--print-latency-ms', type=float, default=5, help="virtual printer write latency")
+    parser.add_argument('--bytes-per-second', type=int, default=None, help="virtual printer transfer rate")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="print the full report as JSON")
+    args = parser.parse_args()
+
+    server = start_local_server(args) if args.local else None
+
+    results = []
+    samples = []
+    lock = threading.Lock()
+    start = time.time()
+    deadline = start + args.duration
+    threads = [threading.Thread(target=run_station, args=(i, args, deadline, results, lock), daemon=True)
+               for i in range(args.stations)]
+    threads.append(threading.Thread(target=sample_queue, args=(args, deadline, samples), daemon=True))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+
+    if server is not None:
+        server.shutdown()
+
+    latencies = sorted(result[1] * 1000 for result in results)
+    errors = sum(1 for result in results if not result[2])
+    codes = sum(result[4] for result in results)
+    report = {
+        'stations': args.stations,
+        'seconds': round(elapsed, 1),
+        'requests': len(results),
+        'codes': codes,
+        'requests_per_second': round(len(results) / elapsed, 1),
+        'codes_per_second': round(codes / elapsed, 1),
+        'error_rate': round(errors / len(results), 4) if results else None,
+        'latency_ms': {
+            'p50': percentile(latencies, 50),
+            'p90': percentile(latencies, 90),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1] if latencies else None
+        },
+        'max_print_queue_depth': max((s['queued'] or 0 for s in samples), default=None),
+        'max_prints_in_flight': max((s['in_flight'] or 0 for s in samples), default=None),
+        'queue_samples': samples
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{report['requests']} requests ({codes} codes) from {args.stations} stations in {report['seconds']} s")
+    print(f"  throughput : {report['requests_per_second']} req/s, {report['codes_per_second']} codes/s")
+    print(f"  errors     : {errors} ({(report['error_rate'] or 0) * 100:.2f}%)")
+    lat = report['latency_ms']
+    if latencies:
+        print(f"  latency ms : p50 {lat['p50']:.1f}  p90 {lat['p90']:.1f}  p99 {lat['p99']:.1f}  max {lat['max']:.1f}")
+    print(f"  print queue: max depth {report['max_print_queue_depth']}, max in flight {report['max_prints_in_flight']}")
+    for sample in samples[::max(len(samples) // 10, 1)]:
+        print(f"    t={sample['t']:>6}s  queued={sample['queued']}  in_flight={sample['in_flight']}")
+
+if __name__ == '__main__':
+    main()
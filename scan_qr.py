@@ -1,95 +1,92 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, send_file, abort
 import os
+import json
 import platform
+import atexit
 import logging
-from escpos import printer as escpos_printer
-import usb.core
+import queue
+import threading
+import time
+
+from src.core.print_batcher import PrintBatcher
+from src.core.qr_parser import QRDataParser
+from src.core.printer_pool import DEFAULT_PRINTER_IDS, PrinterDevice, PrinterPool, discover_usb_printers
+from src.utils.profiling import profiled
+from src.utils.static_assets import ASSET_CACHE_CONTROL, AssetManifest
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Global printer status
+# Printer pool shared by all requests
+printer_pool = PrinterPool()
 printer_available = False
-printer_info = None
+
+# How replacement QR codes are printed: 'native' (GS ( k) or 'raster'. Printers without
+# GS ( k support ignore it or print garbage rather than failing, so there is no automatic
+# fallback; set qr_mode to 'raster' for them.
+qr_print_mode = 'native'
+qr_module_size = 4
+qr_print_stats = {
+    'native': {'prints': 0, 'total_ms': 0.0},
+    'raster': {'prints': 0, 'total_ms': 0.0}
+}
+qr_print_stats_lock = threading.Lock()
+
+# Collects scans into one receipt with a single cut when batch printing is enabled
+print_batcher = None
+
+def load_printer_config(path='settings.json'):
+    """Read the optional 'printers' section from settings.json"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get('printers', {})
+    except Exception:
+        return {}
 
 def detect_printer():
-    """Detect the USB thermal printer and initialize it"""
-    global printer_available, printer_info
+    """Detect USB thermal printers and add them to the printer pool"""
+    global printer_available, qr_print_mode, qr_module_size, print_batcher
     
     try:
-        # Check if backend is available
-        import usb.core
-        import usb.util
-        
-        # Print backend information for debugging
-        logger.info(f"USB backend information: {usb.backend.libusb1.__file__ if hasattr(usb, 'backend') and hasattr(usb.backend, 'libusb1') else 'Not available'}")
-        
-        # Check if libusb is properly installed
-        backend = usb.backend.libusb1.get_backend()
-        if backend is None:
-            logger.error("No USB backend available. Make sure libusb is installed.")
-            printer_available = False
-            return False
-        
-        # Specific Neiko/Beeprt PL70e-BT vendor/product ID from system_profiler output
-        neiko_vendor_id = 0x09c6  # Vendor ID for your Beeprt Printer
-        neiko_product_id = 0x0426  # Product ID for your printer
-        
-        # Try the specific printer first with explicit backend
-        device = usb.core.find(idVendor=neiko_vendor_id, idProduct=neiko_product_id, backend=backend)
-        if device is not None:
-            logger.info(f"Found Neiko/Beeprt PL70e-BT printer with vendor ID: {neiko_vendor_id:04x}, product ID: {neiko_product_id:04x}")
-            
-            # Try to get endpoint information
-            try:
-                # Get configuration
-                cfg = device.get_active_configuration()
-                interface_number = 0
-                
-                # Get interface
-                interface = cfg[(0, 0)]
-                
-                # Get endpoints
-                in_ep = None
-                out_ep = None
-                
-                for ep in interface:
-                    if ep.bEndpointAddress & 0x80:  # IN endpoint
-                        in_ep = ep.bEndpointAddress
-                    else:  # OUT endpoint
-                        out_ep = ep.bEndpointAddress
-                
-                logger.info(f"Detected endpoints - IN: {in_ep}, OUT: {out_ep}")
-                
-                printer_info = {
-                    'vendor_id': neiko_vendor_id,
-                    'product_id': neiko_product_id,
-                    'in_ep': in_ep if in_ep is not None else 0x81,  # Use detected or default
-                    'out_ep': out_ep if out_ep is not None else 0x03  # Use detected or default
-                }
-            except Exception as ep_error:
-                logger.warning(f"Could not detect endpoints automatically: {str(ep_error)}")
-                logger.info("Using default endpoints")
-                printer_info = {
-                    'vendor_id': neiko_vendor_id,
-                    'product_id': neiko_product_id,
-                    'in_ep': 0x81,  # Default input endpoint
-                    'out_ep': 0x03  # Default output endpoint
-                }
-            
-            printer_available = True
-            return True
-            
-        # List all USB devices for debugging
-        devices = usb.core.find(find_all=True, backend=backend)
-        logger.info("Available USB devices:")
-        for dev in devices:
-            logger.info(f"  Vendor ID: 0x{dev.idVendor:04x}, Product ID: 0x{dev.idProduct:04x}")
-        
-        logger.warning("No compatible printer found")
-        printer_available = False
-        return False
+        config = load_printer_config()
+        printer_pool.retry_interval = config.get('retry_interval', printer_pool.retry_interval)
+        qr_print_mode = config.get('qr_mode', qr_print_mode)
+        qr_module_size = config.get('qr_module_size', qr_module_size)
+        
+        batch_config = config.get('batch_print', {})
+        if batch_config.get('enabled'):
+            print_batcher = PrintBatcher(
+                print_qr_batch,
+                batch_config.get('max_items', 10),
+                batch_config.get('window_s', 5.0),
+                batch_config.get('idle_s', 2.0),
+                batch_config.get('max_attempts', 3),
+                batch_config.get('retry_s', 5.0)
+            )
+        
+        backend = os.environ.get('SCANNER_PRINTER_BACKEND', config.get('backend', 'usb'))
+        
+        if backend == 'virtual':
+            # Stand-in printers that capture the ESC/POS stream, for testing without hardware
+            from src.core.virtual_printer import create_virtual_devices
+            devices = create_virtual_devices(config.get('virtual', {}))
+        elif config.get('devices'):
+            # Explicitly configured printers
+            devices = [PrinterDevice.from_config(device) for device in config['devices']]
+        else:
+            # Discover every attached printer matching the known vendor/product IDs
+            printer_ids = config.get('ids') or DEFAULT_PRINTER_IDS
+            devices = discover_usb_printers([tuple(ids) for ids in printer_ids])
+        
+        for device in devices:
+            printer_pool.add(device)
+        
+        if not devices:
+            logger.warning("No compatible printer found")
+        
+        printer_available = printer_pool.available()
+        return printer_available
     
     except Exception as e:
         logger.error(f"Error detecting printer: {str(e)}")
@@ -97,39 +94,30 @@ def detect_printer():
         logger.error(traceback.format_exc())
         printer_available = False
         return False
-        
-def get_printer():
-    """Get a connection to the printer based on the detected printer info"""
-    if not printer_available or not printer_info:
-        logger.warning("Attempted to get printer but no printer is available")
-        return None
-    
-    try:
-        # Create USB printer connection with the detected parameters
-        printer = escpos_printer.Usb(
-            printer_info['vendor_id'],
-            printer_info['product_id'],
-            0,  # USB interface number (usually 0)
-            printer_info['in_ep'],
-            printer_info['out_ep']
-        )
-        return printer
-    except Exception as e:
-        logger.error(f"Error connecting to printer: {str(e)}")
-        return None
+
+def print_sections(p, formatted_result):
+    """Print the formatted sections of a scan result"""
+    sections = formatted_result.split('\n')
+    for section in sections:
+        if section.startswith('📤') or section.startswith('🎨'):
+            # Section header
+            p.set(bold=True)
+            p.text(f"{section}\n")
+            p.set(bold=False)
+        elif section.strip() == '':
+            # Empty line
+            p.text("\n")
+        else:
+            # Regular content
+            p.text(f"{section}\n")
 
 def print_qr_result(formatted_result):
-    """Print the QR code result to the thermal printer"""
-    if not printer_available:
+    """Print the QR code result on the least-busy printer in the pool"""
+    if not printer_pool.available():
         logger.info("Print requested but no printer available")
         return False
     
-    try:
-        # Get printer connection
-        p = get_printer()
-        if not p:
-            return False
-        
+    def job(p):
         # Format and print the result
         p.set(align='center', font='a', width=1, height=1, bold=True)
         p.text("QR SCAN RESULT\n\n")
@@ -137,19 +125,7 @@ def print_qr_result(formatted_result):
         p.set(align='left', font='a', width=1, height=1, bold=False)
         
         # Print the formatted sections
-        sections = formatted_result.split('\n')
-        for section in sections:
-            if section.startswith('📤') or section.startswith('🎨'):
-                # Section header
-                p.set(bold=True)
-                p.text(f"{section}\n")
-                p.set(bold=False)
-            elif section.strip() == '':
-                # Empty line
-                p.text("\n")
-            else:
-                # Regular content
-                p.text(f"{section}\n")
+        print_sections(p, formatted_result)
         
         # Add footer
         p.text("\n")
@@ -159,107 +135,149 @@ def print_qr_result(formatted_result):
         
         # Cut the paper (if supported)
         p.cut()
-        
+    
+    if printer_pool.run(job):
         logger.info("Successfully printed QR scan result")
         return True
-    
-    except Exception as e:
-        logger.error(f"Error printing: {str(e)}")
-        return False
+    return False
 
+def print_qr_batch(formatted_results):
+    """Print several scan results as one job with compact separators and a single cut"""
+    if not printer_pool.available():
+        logger.info("Print requested but no printer available")
+        return False
+    
+    def job(p):
+        p.set(align='center', font='a', width=1, height=1, bold=True)
+        p.text(f"QR SCAN RESULTS ({len(formatted_results)})\n\n")
+        
+        for index, formatted_result in enumerate(formatted_results):
+            if index:
+                p.set(align='center', bold=False)
+                p.text("- - - - - - - - - - - - - - - -\n")
+            p.set(align='left', font='a', width=1, height=1, bold=False)
+            # Blank lines between sections are dropped to save paper
+            print_sections(p, "\n".join(line for line in formatted_result.split('\n') if line.strip()))
+        
+        p.text("\n")
+        p.set(align='center')
+        p.text("--------------------------------\n\n\n")
+        p.cut()
+    
+    if printer_pool.run(job):
+        logger.info(f"Successfully printed batch of {len(formatted_results)} QR scan results")
+        return True
+    return False
 
-app = Flask(__name__)
-
-# QR data parser class
-class QRDataParser:
-    @staticmethod
-    def parse_data(data):
-        """Parse the QR code data into a structured format"""
-        try:
-            lines = data.split('\n')
-            result = {'sender': {}, 'artist': {}}
-            current_section = None
-
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-
-                if line == 'SR:':
-                    current_section = 'sender'
-                    continue
-                elif line == 'AT:':
-                    current_section = 'artist'
-                    continue
+def print_qr_code(p, data):
+    """Print data as a QR code in the configured qr_mode and return the mode used"""
+    mode = 'native' if qr_print_mode == 'native' else 'raster'
+    start = time.perf_counter()
+    # native=True sends GS ( k so the printer renders the code itself
+    p.qr(data, size=qr_module_size, native=(mode == 'native'))
+    # Only the host-side USB write is timed; the printer renders and prints asynchronously
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    with qr_print_stats_lock:
+        qr_print_stats[mode]['prints'] += 1
+        qr_print_stats[mode]['total_ms'] += elapsed_ms
+    logger.info(f"Sent QR code ({mode}) in {elapsed_ms:.1f} ms")
+    return mode
 
-                if current_section and ':' in line:
-                    key, value = line.split(':', 1)
-                    key = key.strip()
-                    value = value.strip()
+def print_replacement_qr(data, formatted_result):
+    """Print a replacement label with the scanned payload as a QR code"""
+    if not printer_pool.available():
+        logger.info("Print requested but no printer available")
+        return False
+    
+    def job(p):
+        p.set(align='center', font='a', width=1, height=1, bold=True)
+        p.text("REPLACEMENT LABEL\n\n")
+        p.set(bold=False)
+        print_qr_code(p, data)
+        
+        # Artist section under the code so the label can be read by eye
+        p.text("\n")
+        p.set(align='left')
+        artist_section = formatted_result.split('🎨 Artist Information', 1)
+        if len(artist_section) == 2:
+            p.text(artist_section[1].strip() + "\n")
+        p.text("\n\n")
+        p.cut()
+    
+    if printer_pool.run(job):
+        logger.info("Successfully printed replacement QR label")
+        return True
+    return False
 
-                    if current_section == 'sender':
-                        if key == 'NM':
-                            result['sender']['name'] = value
-                        elif key == 'ADD':
-                            result['sender']['address'] = value
-                        elif key == 'CT':
-                            result['sender']['city'] = value
-                        elif key == 'STT':
-                            result['sender']['state'] = value
-                        elif key == 'CD':
-                            result['sender']['zip'] = value
+def get_qr_print_stats():
+    """Return the average host-side write time of native vs raster QR printing"""
+    with qr_print_stats_lock:
+        return {
+            mode: {
+                'prints': stats['prints'],
+                'avg_ms': round(stats['total_ms'] / stats['prints'], 1) if stats['prints'] else None
+            }
+            for mode, stats in qr_print_stats.items()
+        }
 
-                    elif current_section == 'artist':
-                        if key == 'NM':
-                            result['artist']['name'] = value
-                        elif key == 'PH':
-                            result['artist']['phone'] = value
-                        elif key == 'ADD':
-                            result['artist']['address'] = value
+# Prints queued by batch requests, drained by background workers
+print_queue = queue.Queue()
+print_workers = []
+print_workers_lock = threading.Lock()
 
-            return result
+def print_worker():
+    """Print queued results one after another"""
+    while True:
+        formatted_result = print_queue.get()
+        try:
+            print_qr_result(formatted_result)
         except Exception as e:
-            return {'error': f"Failed to parse QR data: {str(e)}"}
+            logger.error(f"Error in print worker: {str(e)}")
+        finally:
+            print_queue.task_done()
 
-    @staticmethod
-    def format_result(result):
-        """Format the scan result for display"""
-        if not result or 'error' in result:
-            return "Failed to parse QR code data"
+def queue_print(formatted_result):
+    """Queue a result for printing, starting one worker per pooled printer"""
+    if print_batcher is not None:
+        print_batcher.add(formatted_result)
+        return True
+    
+    with print_workers_lock:
+        while len(print_workers) < max(len(printer_pool.devices), 1):
+            worker = threading.Thread(target=print_worker, name=f"print-worker-{len(print_workers)}", daemon=True)
+            worker.start()
+            print_workers.append(worker)
+    print_queue.put(formatted_result)
+    return True
 
-        formatted = []
-        
-        # Sender Information
-        if result.get('sender'):
-            formatted.append("📤 Sender Information")
-            sender = result['sender']
-            if sender.get('name'):
-                formatted.append(f"Name: {sender['name']}")
-            if sender.get('address'):
-                formatted.append(f"Address: {sender['address']}")
-            if all(sender.get(k) for k in ['city', 'state', 'zip']):
-                formatted.append(f"Location: {sender['city']}, {sender['state']} {sender['zip']}")
-            formatted.append("")
 
-        # Artist Information
-        if result.get('artist'):
-            formatted.append("🎨 Artist Information")
-            artist = result['artist']
-            if artist.get('name'):
-                formatted.append(f"Name: {artist['name']}")
-            if artist.get('phone'):
-                formatted.append(f"Phone: {artist['phone']}")
-            if artist.get('address'):
-                formatted.append(f"Address: {artist['address']}")
+app = Flask(__name__)
 
-        return "\n".join(formatted)
+# Content-hashed scanner assets served from /assets/
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+asset_manifest = AssetManifest(STATIC_DIR)
+app.jinja_env.globals['asset_url'] = asset_manifest.url
 
 @app.route('/')
 def index():
     """Render the main application page"""
-    return render_template('index.html')
+    response = app.make_response(render_template('index.html'))
+    # Revalidate the page so new asset hashes are picked up; the assets themselves stay cached
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/assets/<path:filename>')
+def assets(filename):
+    """Serve a content-hashed static asset with long-lived cache headers"""
+    path = asset_manifest.resolve(filename)
+    if path is None:
+        abort(404)
+    response = send_file(path)
+    response.headers['Cache-Control'] = ASSET_CACHE_CONTROL
+    return response
 
 @app.route('/process_qr', methods=['POST'])
+@profiled('process_qr')
 def process_qr():
     """Process QR code data received from client and print automatically if printer available"""
     data = request.json.get('qr_data')
@@ -272,8 +290,12 @@ def process_qr():
     
     # Print the formatted result automatically if printer is available
     print_success = False
-    if printer_available:
-        print_success = print_qr_result(formatted_result)
+    print_queued = False
+    if printer_pool.available():
+        if print_batcher is not None:
+            print_queued = queue_print(formatted_result)
+        else:
+            print_success = print_qr_result(formatted_result)
     
     # Print the formatted result to the terminal
     print("\n" + "="*50)
@@ -286,361 +308,86 @@ def process_qr():
     return jsonify({
         'success': True,
         'formatted_result': formatted_result,
-        'printer_available': printer_available,
-        'print_success': print_success
+        'printer_available': printer_pool.available(),
+        'print_success': print_success,
+        'print_queued': print_queued
     })
 
-# Create templates directory if it doesn't exist
-os.makedirs('templates', exist_ok=True)
-
-# Create the HTML template with dark theme
-with open('templates/index.html', 'w') as f:
-    f.write("""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>QR Code Scanner</title>
-    <style>
-        :root {
-            --bg-color: #121212;
-            --surface-color: #1e1e1e;
-            --primary-color: #7b68ee;
-            --primary-dark: #6a5acd;
-            --secondary-color: #536dfe;
-            --success-color: #4CAF50;
-            --success-dark: #3d8c40;
-            --text-primary: #ffffff;
-            --text-secondary: #b0b0b0;
-            --border-color: #2c2c2c;
-            --highlight-color: #00e676;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 20px;
-            max-width: 800px;
-            margin: 0 auto;
-            background-color: var(--bg-color);
-            color: var(--text-primary);
-        }
-        
-        h1 {
-            text-align: center;
-            color: var(--text-primary);
-            margin-bottom: 30px;
-        }
-        
-        #video-container {
-            width: 100%;
-            max-width: 640px;
-            margin: 0 auto;
-            position: relative;
-            overflow: hidden;
-            border-radius: 12px;
-            box-shadow: 0 8px 16px rgba(0,0,0,0.4);
-            border: 1px solid var(--border-color);
-            background-color: #000;
-        }
-        
-        #qr-video {
-            width: 100%;
-            height: auto;
-            background-color: #000;
-        }
-        
-        #qr-canvas {
-            display: none;
-        }
-        
-        #qr-result {
-            margin-top: 25px;
-            padding: 20px;
-            border: 1px solid var(--border-color);
-            border-radius: 12px;
-            background-color: var(--surface-color);
-            white-space: pre-line;
-            display: none;
-            box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-            line-height: 1.6;
-        }
-        
-        #status-message {
-            text-align: center;
-            margin: 20px 0;
-            font-weight: 500;
-            color: var(--text-secondary);
-            background-color: var(--surface-color);
-            padding: 10px;
-            border-radius: 30px;
-            max-width: 80%;
-            margin-left: auto;
-            margin-right: auto;
-        }
-        
-        #captured-image {
-            width: 100%;
-            max-width: 640px;
-            margin: 25px auto;
-            display: none;
-            border-radius: 12px;
-            box-shadow: 0 8px 16px rgba(0,0,0,0.4);
-            border: 1px solid var(--border-color);
-        }
-        
-        button {
-            padding: 14px 28px;
-            background-color: var(--primary-color);
-            color: white;
-            border: none;
-            border-radius: 30px;
-            font-size: 16px;
-            font-weight: 500;
-            cursor: pointer;
-            display: block;
-            margin: 25px auto;
-            transition: all 0.3s ease;
-            box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-        }
-        
-        button:hover {
-            background-color: var(--primary-dark);
-            transform: translateY(-2px);
-            box-shadow: 0 6px 12px rgba(0,0,0,0.3);
-        }
-        
-        #rescan-button {
-            display: none;
-            background-color: var(--secondary-color);
-        }
-        
-        #rescan-button:hover {
-            background-color: #4a62e5;
-        }
-
-        /* Styles for the formatted results */
-        #qr-result {
-            font-size: 15px;
-        }
-
-        #qr-result strong {
-            color: var(--text-primary);
-        }
-
-        /* QR info sections */
-        #qr-result p:first-child,
-        #qr-result p:nth-of-type(3) {
-            font-weight: bold;
-            color: var(--primary-color);
-            font-size: 18px;
-            margin-top: 15px;
-            margin-bottom: 10px;
-            border-bottom: 1px solid var(--border-color);
-            padding-bottom: 5px;
-        }
-    </style>
-</head>
-<body>
-    <h1>QR Code Scanner</h1>
-    
-    <div id="video-container">
-        <video id="qr-video" autoplay playsinline></video>
-    </div>
-    <canvas id="qr-canvas"></canvas>
-    
-    <div id="status-message">Starting camera...</div>
+@app.route('/process_qr_batch', methods=['POST'])
+@profiled('process_qr_batch')
+def process_qr_batch():
+    """Process several QR payloads in one request and queue their prints"""
+    payloads = request.json.get('qr_data')
+    if not payloads or not isinstance(payloads, list):
+        return jsonify({'error': 'No QR data received'}), 400
     
-    <img id="captured-image" alt="Captured QR Code">
+    can_print = printer_pool.available()
+    results = []
+    for data in payloads:
+        parsed_data = QRDataParser.parse_data(data)
+        formatted_result = QRDataParser.format_result(parsed_data)
+        results.append({
+            'success': 'error' not in parsed_data,
+            'formatted_result': formatted_result,
+            'print_queued': queue_print(formatted_result) if can_print else False
+        })
     
-    <div id="qr-result"></div>
+    logger.info(f"Processed batch of {len(payloads)} QR codes")
     
-    <button id="rescan-button">Scan New QR Code</button>
+    return jsonify({
+        'success': True,
+        'results': results,
+        'printer_available': can_print,
+        'print_queue_depth': print_queue.qsize()
+    })
+
+@app.route('/reprint_qr', methods=['POST'])
+def reprint_qr():
+    """Print the scanned payload back as a QR code for a damaged label"""
+    data = request.json.get('qr_data')
+    if not data:
+        return jsonify({'error': 'No QR data received'}), 400
     
-    <!-- Include jsQR library for QR detection -->
-    <script src="https://cdn.jsdelivr.net/npm/jsqr@1.4.0/dist/jsQR.min.js"></script>
+    formatted_result = QRDataParser.format_result(QRDataParser.parse_data(data))
+    print_success = print_replacement_qr(data, formatted_result)
     
-    <script>
-        // DOM elements
-        const video = document.getElementById('qr-video');
-        const canvas = document.getElementById('qr-canvas');
-        const ctx = canvas.getContext('2d');
-        const statusMessage = document.getElementById('status-message');
-        const qrResult = document.getElementById('qr-result');
-        const capturedImage = document.getElementById('captured-image');
-        const rescanButton = document.getElementById('rescan-button');
-        
-        // Scanner state
-        let scanning = false;
-        let scanInterval = null;
-        let videoStream = null;
-        
-        // Initialize camera on page load
-        document.addEventListener('DOMContentLoaded', startCamera);
-        
-        // Start the camera
-        function startCamera() {
-            statusMessage.textContent = "Requesting camera access...";
-            
-            // Get user's camera
-            navigator.mediaDevices.getUserMedia({ 
-                video: { 
-                    facingMode: "environment",
-                    width: { ideal: 640 },
-                    height: { ideal: 480 }
-                } 
-            })
-            .then(stream => {
-                videoStream = stream;
-                video.srcObject = stream;
-                
-                // Wait for video to be ready
-                video.onloadedmetadata = () => {
-                    video.play();
-                    
-                    // Set canvas size to match video
-                    canvas.width = video.videoWidth;
-                    canvas.height = video.videoHeight;
-                    
-                    // Start scanning
-                    startScanning();
-                };
-            })
-            .catch(err => {
-                statusMessage.textContent = `Camera error: ${err.message}`;
-                console.error("Camera error:", err);
-            });
-        }
-        
-        // Start QR code scanning
-        function startScanning() {
-            if (scanning) return;
-            
-            scanning = true;
-            statusMessage.textContent = "Scanning for QR code...";
-            video.style.display = 'block';
-            capturedImage.style.display = 'none';
-            qrResult.style.display = 'none';
-            rescanButton.style.display = 'none';
-            
-            // Process video frames
-            scanInterval = setInterval(scanVideoFrame, 100); // 10 frames per second
-        }
-        
-        // Process a video frame to detect QR codes
-        function scanVideoFrame() {
-            if (!scanning) return;
-            
-            // Draw current video frame to canvas
-            ctx.drawImage(video, 0, 0, canvas.width, canvas.height);
-            
-            // Get image data for processing
-            const imageData = ctx.getImageData(0, 0, canvas.width, canvas.height);
-            
-            // Look for QR code in the image
-            const code = jsQR(imageData.data, imageData.width, imageData.height, {
-                inversionAttempts: "dontInvert"
-            });
-            
-            if (code) {
-                // QR code found!
-                console.log("QR code detected:", code.data);
-                
-                // Stop scanning
-                stopScanning();
-                
-                // Highlight the QR code on canvas
-                highlightQR(code.location);
-                
-                // Display the captured image
-                capturedImage.src = canvas.toDataURL('image/jpeg');
-                capturedImage.style.display = 'block';
-                video.style.display = 'none';
-                
-                // Process QR code data
-                processQRData(code.data);
-            }
-        }
-        
-        // Stop scanning
-        function stopScanning() {
-            scanning = false;
-            clearInterval(scanInterval);
-            statusMessage.textContent = "QR Code detected!";
-            rescanButton.style.display = 'block';
-        }
-        
-        // Highlight the detected QR code
-        function highlightQR(location) {
-            // Draw the video frame again
-            ctx.drawImage(video, 0, 0, canvas.width, canvas.height);
-            
-            // Draw QR code boundary
-            ctx.beginPath();
-            ctx.moveTo(location.topLeftCorner.x, location.topLeftCorner.y);
-            ctx.lineTo(location.topRightCorner.x, location.topRightCorner.y);
-            ctx.lineTo(location.bottomRightCorner.x, location.bottomRightCorner.y);
-            ctx.lineTo(location.bottomLeftCorner.x, location.bottomLeftCorner.y);
-            ctx.lineTo(location.topLeftCorner.x, location.topLeftCorner.y);
-            ctx.lineWidth = 4;
-            ctx.strokeStyle = '#00e676';
-            ctx.stroke();
-            
-            // Add timestamp
-            const now = new Date();
-            const timestamp = now.toLocaleString();
-            ctx.font = '16px "Segoe UI", sans-serif';
-            ctx.fillStyle = '#00e676';
-            ctx.fillText(`Scanned: ${timestamp}`, 10, 30);
-        }
-        
-        // Process QR code data with the backend
-        function processQRData(data) {
-            fetch('/process_qr', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({ qr_data: data }),
-            })
-            .then(response => response.json())
-            .then(result => {
-                if (result.success) {
-                    // Display formatted result
-                    qrResult.textContent = result.formatted_result;
-                    qrResult.style.display = 'block';
-                } else {
-                    qrResult.textContent = `Error: ${result.error}`;
-                    qrResult.style.display = 'block';
-                }
-            })
-            .catch(error => {
-                console.error('Error processing QR data:', error);
-                qrResult.textContent = `Failed to process QR code: ${error.message}`;
-                qrResult.style.display = 'block';
-            });
-        }
-        
-        // Rescan button handler
-        rescanButton.addEventListener('click', startScanning);
-        
-        // Clean up resources when page is unloaded
-        window.addEventListener('beforeunload', () => {
-            if (videoStream) {
-                videoStream.getTracks().forEach(track => track.stop());
-            }
-        });
-    </script>
-</body>
-</html>
-    """)
+    return jsonify({
+        'success': print_success,
+        'printer_available': printer_pool.available(),
+        'print_success': print_success
+    })
+
+@app.route('/flush_prints', methods=['POST'])
+def flush_prints():
+    """Print any batched scan results immediately"""
+    pending = print_batcher.pending() if print_batcher else 0
+    success = print_batcher.flush() if pending else True
+    return jsonify({'success': success, 'flushed': pending})
+
+@app.route('/printer_stats')
+def printer_stats():
+    """Report health and throughput for each pooled printer"""
+    printers = printer_pool.stats()
+    return jsonify({
+        'printers': printers,
+        'qr_printing': get_qr_print_stats(),
+        'print_queue_depth': print_queue.qsize() + (print_batcher.pending() if print_batcher else 0),
+        'prints_in_flight': sum(printer['busy'] for printer in printers),
+        'batch_printing': print_batcher.stats() if print_batcher else None
+    })
 
 if __name__ == '__main__':
+    missing_assets = asset_manifest.missing()
+    if missing_assets:
+        print(f"Static assets missing from {STATIC_DIR}: {missing_assets}; the scanner page will not load")
+    
     # Detect printer at startup
     printer_detected = detect_printer()
     if printer_detected:
-        print(f"Printer detected and ready: {printer_info}")
+        print(f"Printers detected and ready: {[device.info() for device in printer_pool.devices]}")
+        printer_pool.start_health_checks()
+        if print_batcher is not None:
+            atexit.register(print_batcher.flush)
     else:
         print("No compatible printer detected. Running in display-only mode.")
     
@@ -0,0 +1,193 @@
+import base64
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from src.core.db_handler import ENTRY_COLUMNS, ENTRY_JOIN, ENTRY_SELECT, EntryRecord, entry_from_record, png_bytes
+
+class ArchiveHandler:
+    """Moves old qr_codes rows into a separate archive database.
+
+    Rows are copied and deleted in small batches, each in its own short
+    transaction, so live uploads only ever wait for one batch. Images are
+    kept as raw PNG BLOBs, a quarter smaller than the base64 text in the
+    live table. The archive stays searchable through ``search``.
+    """
+
+    def __init__(self, db_path: str = "qrcodes.db", archive_path: str = "qrcodes_archive.db"):
+        self.db_path = db_path
+        self.archive_path = archive_path
+        self._init_archive()
+
+    def _init_archive(self):
+        """Initialize the archive database."""
+        conn = sqlite3.connect(self.archive_path)
+        c = conn.cursor()
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS qr_codes_archive (
+                reference_id TEXT PRIMARY KEY,
+                sender_name TEXT NOT NULL,
+                sender_address TEXT NOT NULL,
+                sender_city TEXT NOT NULL,
+                sender_state TEXT NOT NULL,
+                sender_zip TEXT NOT NULL,
+                artist_name TEXT NOT NULL,
+                phone TEXT,
+                address TEXT,
+                qr_code BLOB,
+                timestamp DATETIME,
+                content_hash TEXT,
+                archived_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                upload_id TEXT
+            )
+        ''')
+        c.execute('PRAGMA table_info(qr_codes_archive)')
+        if 'upload_id' not in [row[1] for row in c.fetchall()]:
+            c.execute('ALTER TABLE qr_codes_archive ADD COLUMN upload_id TEXT')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_archive_artist ON qr_codes_archive (artist_name)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_archive_timestamp ON qr_codes_archive (timestamp)')
+        conn.commit()
+        conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.create_function('png_bytes', 1, png_bytes)
+        conn.execute('ATTACH DATABASE ? AS archive', (self.archive_path,))
+        return conn
+
+    def _archive_batch(self, conn, where: str, params: list, batch_size: int) -> int:
+        """Move the oldest ``batch_size`` rows matching ``where`` to the archive."""
+        columns = ', '.join(ENTRY_COLUMNS)
+        # The archive keeps sender details on each row so it stays self-contained
+        selected = ENTRY_SELECT.replace('q.qr_code', 'png_bytes(q.qr_code)')
+        archived_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        c = conn.cursor()
+        c.execute('BEGIN IMMEDIATE')
+        try:
+            c.execute(f'''
+                SELECT rowid FROM main.qr_codes WHERE {where}
+                ORDER BY timestamp ASC LIMIT ?
+            ''', params + [batch_size])
+            rowids = [row[0] for row in c.fetchall()]
+            if not rowids:
+                conn.rollback()
+                return 0
+            placeholders = ', '.join('?' for _ in rowids)
+            c.execute(f'''
+                INSERT OR REPLACE INTO archive.qr_codes_archive ({columns}, archived_at)
+                SELECT {selected}, ? FROM {ENTRY_JOIN} WHERE q.rowid IN ({placeholders})
+            ''', [archived_at] + rowids)
+            c.execute(f'DELETE FROM main.qr_codes WHERE rowid IN ({placeholders})', rowids)
+            conn.commit()
+            return len(rowids)
+        except Exception:
+            conn.rollback()
+            raise
+
+    def apply_retention(self, max_age_days: int = None, max_rows: int = None,
+                        batch_size: int = 500, pause: float = 0.05, vacuum_pages: int = 1000) -> dict:
+        """Archive rows older than ``max_age_days`` and beyond the newest ``max_rows``."""
+        summary = {'by_age': 0, 'by_count': 0, 'vacuumed_pages': 0}
+        try:
+            conn = self._connect()
+            conn.isolation_level = None  # Explicit per-batch transactions
+
+            if max_age_days is not None:
+                cutoff = (datetime.now() - timedelta(days=max_age_days)).strftime('%Y-%m-%d %H:%M:%S')
+                while True:
+                    moved = self._archive_batch(conn, 'timestamp < ?', [cutoff], batch_size)
+                    summary['by_age'] += moved
+                    if moved < batch_size:
+                        break
+                    time.sleep(pause)  # Let live writers in between batches
+
+            if max_rows is not None:
+                excess = conn.execute('SELECT COUNT(*) FROM qr_codes').fetchone()[0] - max_rows
+                while excess > 0:
+                    moved = self._archive_batch(conn, '1 = 1', [], min(batch_size, excess))
+                    if not moved:
+                        break
+                    summary['by_count'] += moved
+                    excess -= moved
+                    time.sleep(pause)
+
+            if summary['by_age'] or summary['by_count']:
+                summary['vacuumed_pages'] = self.incremental_vacuum(conn, vacuum_pages)
+            return summary
+        except Exception as e:
+            print(f"Error applying retention: {e}")
+            return summary
+        finally:
+            conn.close()
+
+    def incremental_vacuum(self, conn, pages: int) -> int:
+        """Return up to ``pages`` free pages of the live database to the OS."""
+        if conn.execute('PRAGMA main.auto_vacuum').fetchone()[0] != 2:
+            # Database predates incremental auto-vacuum; free pages are reused by new rows
+            return 0
+        before = conn.execute('PRAGMA main.freelist_count').fetchone()[0]
+        # executescript steps the pragma to completion; execute() frees a single page
+        conn.executescript(f'PRAGMA main.incremental_vacuum({int(pages)});')
+        after = conn.execute('PRAGMA main.freelist_count').fetchone()[0]
+        return before - after
+
+    def incremental_vacuum_enabled(self) -> bool:
+        """Whether the live database can hand freed pages back incrementally."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+        finally:
+            conn.close()
+
+    def enable_incremental_vacuum(self) -> bool:
+        """Convert a database created before incremental auto-vacuum, once.
+
+        The auto_vacuum mode of an existing file only changes with a full
+        VACUUM, which rewrites the whole database and blocks writers while
+        it runs, so this is started by the operator rather than at startup.
+        """
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.isolation_level = None  # VACUUM cannot run inside a transaction
+            conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            conn.execute('VACUUM')
+            return conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+        except Exception as e:
+            print(f"Error converting database to incremental vacuum: {e}")
+            return False
+        finally:
+            conn.close()
+
+    def search(self, text: str = '', limit: int = 50, include_image: bool = True) -> list:
+        """Search archived entries by artist name, reference ID or address."""
+        try:
+            conn = sqlite3.connect(self.archive_path)
+            columns = ', '.join(column if column != 'qr_code' or include_image else 'NULL'
+                                for column in ENTRY_COLUMNS)
+            pattern = f"%{text}%"
+            rows = conn.execute(f'''
+                SELECT {columns} FROM qr_codes_archive
+                WHERE artist_name LIKE ? OR reference_id LIKE ? OR address LIKE ?
+                ORDER BY timestamp DESC LIMIT ?
+            ''', (pattern, pattern, pattern, limit)).fetchall()
+
+            entries = []
+            for row in rows:
+                record = EntryRecord._make(row)
+                if isinstance(record.qr_code, bytes):
+                    record = record._replace(qr_code=base64.b64encode(record.qr_code).decode())
+                entries.append(entry_from_record(record))
+            return entries
+        except Exception as e:
+            print(f"Error searching archive: {e}")
+            return []
+        finally:
+            conn.close()
+
+    def count(self) -> int:
+        """Return the number of archived entries."""
+        conn = sqlite3.connect(self.archive_path)
+        try:
+            return conn.execute('SELECT COUNT(*) FROM qr_codes_archive').fetchone()[0]
+        finally:
+            conn.close()
@@ -0,0 +1,38 @@
+import hashlib
+import json
+import math
+
+from src.core.payload_templates import SENDER_FIELDS
+
+def _canonical(value) -> str:
+    """Normalize a single field value for hashing."""
+    if value is None:
+        return ''
+    if isinstance(value, float) and math.isnan(value):
+        return ''
+    return str(value).strip()
+
+def compute_content_hash(sender: dict, artist_name, phone, address) -> str:
+    """Return a stable SHA-256 hex digest of a row's canonical payload."""
+    payload = [
+        _canonical(sender.get('name')),
+        _canonical(sender.get('address')),
+        _canonical(sender.get('city')),
+        _canonical(sender.get('state')),
+        _canonical(sender.get('zip')),
+        _canonical(artist_name),
+        _canonical(phone),
+        _canonical(address),
+    ]
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+def artist_key(artist_name) -> str:
+    """Return the key used to match an artist row across uploads."""
+    return _canonical(artist_name).casefold()
+
+def compute_sender_hash(sender: dict) -> str:
+    """Return a stable SHA-256 hex digest identifying a sender profile."""
+    payload = [_canonical(sender.get(field)) for field in SENDER_FIELDS]
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
@@ -1,56 +1,354 @@
+import base64
 import sqlite3
+from collections import namedtuple
 from datetime import datetime
 
+from src.core.content_hash import artist_key, compute_content_hash, compute_sender_hash
+from src.core.id_generator import new_reference_id
+from src.core.payload_templates import SENDER_FIELDS
+from src.utils.profiling import profiled
+
+# Attempts at a fresh reference ID when an insert hits an existing one
+MAX_ID_RETRIES = 3
+
+# Keep IN (...) lookups below SQLite's default host parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+ENTRY_COLUMNS = (
+    'reference_id', 'sender_name', 'sender_address', 'sender_city', 'sender_state', 'sender_zip',
+    'artist_name', 'phone', 'address', 'qr_code', 'timestamp', 'content_hash', 'upload_id'
+)
+
+# Compact, flat history row yielded by DatabaseHandler.iter_entries
+EntryRecord = namedtuple('EntryRecord', ENTRY_COLUMNS)
+
+# qr_codes stores a sender_id in place of the five sender columns of ENTRY_COLUMNS
+SENDER_COLUMNS = ('sender_name', 'sender_address', 'sender_city', 'sender_state', 'sender_zip')
+QR_CODE_COLUMNS = ('reference_id', 'sender_id') + ENTRY_COLUMNS[1 + len(SENDER_COLUMNS):]
+
+# ENTRY_COLUMNS as expressions over qr_codes joined to senders, for queries that need the join
+ENTRY_SELECT = ', '.join(
+    f"s.{column[len('sender_'):]}" if column in SENDER_COLUMNS else f"q.{column}" for column in ENTRY_COLUMNS
+)
+ENTRY_JOIN = 'qr_codes q JOIN senders s ON s.sender_id = q.sender_id'
+
+# Supported iter_entries filters mapped to their SQL conditions
+ENTRY_FILTERS = {
+    'since': 'timestamp >= ?',
+    'until': 'timestamp < ?',
+    'sender_name': 'sender_id IN (SELECT sender_id FROM senders WHERE name = ?)',
+    'artist_name': 'artist_name = ?',
+    'content_hash': 'content_hash = ?',
+    'upload_id': 'upload_id = ?'
+}
+
+# Aggregates kept by triggers on qr_codes; {row} is NEW or OLD
+STATS_DAY = "COALESCE(date({row}.timestamp), '')"
+STATS_SENDER = "(SELECT name FROM senders WHERE sender_id = {row}.sender_id)"
+STATS_ADD = f'''
+    INSERT INTO qr_stats (day, sender_name, upload_id, codes)
+    VALUES ({STATS_DAY}, {STATS_SENDER}, COALESCE({{row}}.upload_id, ''), 1)
+    ON CONFLICT (day, sender_name, upload_id) DO UPDATE SET codes = codes + 1;
+'''
+STATS_REMOVE = f'''
+    UPDATE qr_stats SET codes = codes - 1
+    WHERE day = {STATS_DAY} AND sender_name = {STATS_SENDER} AND upload_id = COALESCE({{row}}.upload_id, '');
+    DELETE FROM qr_stats
+    WHERE day = {STATS_DAY} AND sender_name = {STATS_SENDER} AND upload_id = COALESCE({{row}}.upload_id, '')
+      AND codes <= 0;
+'''
+
+QR_CODES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        reference_id TEXT PRIMARY KEY,
+        sender_id INTEGER NOT NULL REFERENCES senders (sender_id),
+        artist_name TEXT NOT NULL,
+        phone TEXT,
+        address TEXT,
+        qr_code TEXT NOT NULL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        content_hash TEXT,
+        upload_id TEXT,
+        artist_key TEXT
+    )
+'''
+
+def entry_from_record(record: EntryRecord) -> dict:
+    """Expand a compact record into the nested entry dict used by the UI."""
+    return {
+        'reference_id': record.reference_id,
+        'data': {
+            'sender': {
+                'name': record.sender_name,
+                'address': record.sender_address,
+                'city': record.sender_city,
+                'state': record.sender_state,
+                'zip': record.sender_zip
+            },
+            'Artist Name': record.artist_name,
+            'Phone': record.phone or '',
+            'Address': record.address or ''
+        },
+        'qr_code': record.qr_code,
+        'timestamp': record.timestamp,
+        'content_hash': record.content_hash,
+        'upload_id': record.upload_id
+    }
+
+def png_bytes(qr_code):
+    """Decode a stored base64 qr_code to raw PNG bytes for compact storage.
+
+    Empty values become None; text that is not base64 is returned unchanged.
+    """
+    if not qr_code:
+        return None
+    try:
+        return base64.b64decode(qr_code, validate=True)
+    except ValueError:
+        return qr_code
+
 class DatabaseHandler:
     def __init__(self, db_path: str = "qrcodes.db"):
         self.db_path = db_path
+        # sender_id -> (name, address, city, state, zip); profiles never change once stored
+        self._sender_profiles = {}
         self._init_db()
 
     def _init_db(self):
         """Initialize database with required tables."""
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
+        # Only takes effect on a new database; lets archival reclaim space incrementally
+        c.execute('PRAGMA auto_vacuum = INCREMENTAL')
         c.execute('''
-            CREATE TABLE IF NOT EXISTS qr_codes (
-                reference_id TEXT PRIMARY KEY,
-                sender_name TEXT NOT NULL,
-                sender_address TEXT NOT NULL,
-                sender_city TEXT NOT NULL,
-                sender_state TEXT NOT NULL,
-                sender_zip TEXT NOT NULL,
-                artist_name TEXT NOT NULL,
-                phone TEXT,
-                address TEXT,
-                qr_code TEXT NOT NULL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            CREATE TABLE IF NOT EXISTS senders (
+                sender_id INTEGER PRIMARY KEY,
+                profile_hash TEXT NOT NULL UNIQUE,
+                name TEXT NOT NULL,
+                address TEXT NOT NULL,
+                city TEXT NOT NULL,
+                state TEXT NOT NULL,
+                zip TEXT NOT NULL
             )
         ''')
+        c.execute(QR_CODES_TABLE.format(table='qr_codes'))
+        c.execute('PRAGMA table_info(qr_codes)')
+        columns = [row[1] for row in c.fetchall()]
+        if 'content_hash' not in columns:
+            c.execute('ALTER TABLE qr_codes ADD COLUMN content_hash TEXT')
+        if 'upload_id' not in columns:
+            c.execute('ALTER TABLE qr_codes ADD COLUMN upload_id TEXT')
+        if 'artist_key' not in columns:
+            c.execute('ALTER TABLE qr_codes ADD COLUMN artist_key TEXT')
+        if 'sender_name' in columns:
+            self._migrate_senders(c)
+        c.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_qr_codes_content_hash
+            ON qr_codes (content_hash)
+        ''')
+        c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_qr_codes_timestamp
+            ON qr_codes (timestamp)
+        ''')
+        # Artists are matched on their normalized key, not the name as typed
+        c.execute('DROP INDEX IF EXISTS idx_qr_codes_sender_artist')
+        c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_qr_codes_sender_artist_key
+            ON qr_codes (sender_id, artist_key)
+        ''')
+        self._backfill_artist_keys(c)
+        self._backfill_content_hashes(c)
+        self._init_stats(c)
         conn.commit()
         conn.close()
 
+    def _init_stats(self, c):
+        """Create the qr_stats aggregates and the triggers that keep them current.
+
+        qr_stats holds the number of stored codes per day, sender and
+        upload (upload_id '' for codes saved outside an upload job). The
+        triggers update it on every insert, delete and update of qr_codes,
+        whichever path makes the change, so it always matches a GROUP BY
+        over qr_codes without ever running one.
+        """
+        c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'qr_stats'")
+        exists = c.fetchone() is not None
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS qr_stats (
+                day TEXT NOT NULL,
+                sender_name TEXT NOT NULL,
+                upload_id TEXT NOT NULL,
+                codes INTEGER NOT NULL,
+                PRIMARY KEY (day, sender_name, upload_id)
+            ) WITHOUT ROWID
+        ''')
+        for name, event, body in (
+            ('qr_stats_insert', 'AFTER INSERT', STATS_ADD.format(row='NEW')),
+            ('qr_stats_delete', 'AFTER DELETE', STATS_REMOVE.format(row='OLD')),
+            ('qr_stats_update', 'AFTER UPDATE OF timestamp, sender_id, upload_id',
+             STATS_REMOVE.format(row='OLD') + STATS_ADD.format(row='NEW')),
+        ):
+            c.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {event} ON qr_codes BEGIN {body} END')
+        if not exists:
+            c.execute(f'''
+                INSERT INTO qr_stats (day, sender_name, upload_id, codes)
+                SELECT {STATS_DAY.format(row='q')}, s.name, COALESCE(q.upload_id, ''), COUNT(*)
+                FROM {ENTRY_JOIN} GROUP BY 1, 2, 3
+            ''')
+
+    def _migrate_senders(self, c):
+        """Move the per-row sender columns of an older qr_codes table into senders.
+
+        SQLite cannot drop indexed columns in place, so the table is rebuilt
+        in rowid order with a sender_id and the old table dropped. Its
+        indexes and triggers go with it and are recreated by _init_db.
+        """
+        c.connection.create_function('sender_hash', len(SENDER_FIELDS),
+                                     lambda *values: compute_sender_hash(dict(zip(SENDER_FIELDS, values))))
+        c.execute('SELECT DISTINCT sender_name, sender_address, sender_city, sender_state, sender_zip FROM qr_codes')
+        for row in c.fetchall():
+            self._sender_id(c, dict(zip(SENDER_FIELDS, row)))
+        c.execute(QR_CODES_TABLE.format(table='qr_codes_migrated'))
+        c.execute(f'''
+            INSERT INTO qr_codes_migrated ({', '.join(QR_CODE_COLUMNS)})
+            SELECT q.reference_id, s.sender_id, {', '.join('q.' + column for column in QR_CODE_COLUMNS[2:])}
+            FROM qr_codes q JOIN senders s
+              ON s.profile_hash = sender_hash(q.sender_name, q.sender_address, q.sender_city,
+                                              q.sender_state, q.sender_zip)
+            ORDER BY q.rowid
+        ''')
+        c.execute('SELECT (SELECT COUNT(*) FROM qr_codes), (SELECT COUNT(*) FROM qr_codes_migrated)')
+        before, after = c.fetchone()
+        if before != after:
+            # Nothing is committed; the old table is left as it was
+            raise RuntimeError(f"Sender migration copied {after} of {before} rows")
+        c.execute('DROP TABLE qr_codes')
+        c.execute('ALTER TABLE qr_codes_migrated RENAME TO qr_codes')
+        # Rebuilt from the migrated rows by _init_stats
+        c.execute('DROP TABLE IF EXISTS qr_stats')
+
+    def _sender_id(self, c, sender: dict, known: dict = None) -> int:
+        """Return the ID of a sender profile, storing the profile if it is new.
+
+        ``known`` maps profile hashes to IDs already resolved in the current
+        transaction, so bulk saves look each sender up once.
+        """
+        profile_hash = compute_sender_hash(sender)
+        if known is not None and profile_hash in known:
+            return known[profile_hash]
+        c.execute('''
+            INSERT OR IGNORE INTO senders (profile_hash, name, address, city, state, zip)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (profile_hash, sender['name'], sender['address'], sender['city'], sender['state'], sender['zip']))
+        c.execute('SELECT sender_id FROM senders WHERE profile_hash = ?', (profile_hash,))
+        sender_id = c.fetchone()[0]
+        if known is not None:
+            known[profile_hash] = sender_id
+        return sender_id
+
+    def get_sender(self, sender_id: int):
+        """Return a sender profile as a (name, address, city, state, zip) tuple, or None."""
+        profile = self._sender_profiles.get(sender_id)
+        if profile is None:
+            # Sender profiles are few; load them all on the first miss
+            conn = sqlite3.connect(self.db_path)
+            try:
+                rows = conn.execute('SELECT sender_id, name, address, city, state, zip FROM senders').fetchall()
+            finally:
+                conn.close()
+            self._sender_profiles.update((row[0], row[1:]) for row in rows)
+            profile = self._sender_profiles.get(sender_id)
+        return profile
+
+    def _backfill_artist_keys(self, c):
+        """Compute artist keys for rows saved before they were stored."""
+        c.execute('SELECT rowid, artist_name FROM qr_codes WHERE artist_key IS NULL')
+        c.executemany('UPDATE qr_codes SET artist_key = ? WHERE rowid = ?',
+                      [(artist_key(row[1]), row[0]) for row in c.fetchall()])
+
+    def _backfill_content_hashes(self, c):
+        """Compute content hashes for rows saved before hashing existed."""
+        c.execute(f'''
+            SELECT q.reference_id, s.name, s.address, s.city, s.state, s.zip, q.artist_name, q.phone, q.address
+            FROM {ENTRY_JOIN} WHERE q.content_hash IS NULL
+        ''')
+        rows = c.fetchall()
+        for row in rows:
+            sender = {
+                'name': row[1],
+                'address': row[2],
+                'city': row[3],
+                'state': row[4],
+                'zip': row[5]
+            }
+            content_hash = compute_content_hash(sender, row[6], row[7], row[8])
+            try:
+                c.execute('UPDATE qr_codes SET content_hash = ? WHERE reference_id = ?',
+                          (content_hash, row[0]))
+            except sqlite3.IntegrityError:
+                # Duplicate of an older row; leave it unhashed
+                pass
+
+    def _insert_entry(self, c, entry: dict, sender_ids: dict = None):
+        """Insert one entry, picking a new reference ID if the current one is taken."""
+        sender_id = self._sender_id(c, entry['data']['sender'], sender_ids)
+        for attempt in range(MAX_ID_RETRIES + 1):
+            try:
+                c.execute('''
+                    INSERT INTO qr_codes (
+                        reference_id, sender_id, artist_name, phone, address, qr_code, timestamp,
+                        content_hash, upload_id, artist_key
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    entry['reference_id'],
+                    sender_id,
+                    entry['data']['Artist Name'],
+                    entry['data']['Phone'],
+                    entry['data']['Address'],
+                    entry['qr_code'],
+                    entry['timestamp'],
+                    entry.get('content_hash'),
+                    entry.get('upload_id'),
+                    artist_key(entry['data']['Artist Name'])
+                ))
+                return
+            except sqlite3.IntegrityError as e:
+                if 'reference_id' not in str(e) or attempt == MAX_ID_RETRIES:
+                    raise
+                entry['reference_id'] = new_reference_id()
+
+    def _update_entry(self, c, entry: dict, sender_ids: dict = None) -> bool:
+        """Overwrite the row with the entry's reference ID."""
+        c.execute('''
+            UPDATE qr_codes SET
+                sender_id = ?, artist_name = ?, phone = ?, address = ?, qr_code = ?, timestamp = ?,
+                content_hash = ?, upload_id = ?, artist_key = ?
+            WHERE reference_id = ?
+        ''', (
+            self._sender_id(c, entry['data']['sender'], sender_ids),
+            entry['data']['Artist Name'],
+            entry['data']['Phone'],
+            entry['data']['Address'],
+            entry['qr_code'],
+            entry['timestamp'],
+            entry.get('content_hash'),
+            entry.get('upload_id'),
+            artist_key(entry['data']['Artist Name']),
+            entry['reference_id']
+        ))
+        return c.rowcount > 0
+
+    @profiled('DatabaseHandler.save_entry')
     def save_entry(self, entry: dict) -> bool:
-        """Save QR code entry to database."""
+        """Save QR code entry to database.
+
+        If the reference ID is already taken, the entry is given a new one
+        (updated in place) and the insert is retried.
+        """
         try:
             conn = sqlite3.connect(self.db_path)
             c = conn.cursor()
-            c.execute('''
-                INSERT INTO qr_codes (
-                    reference_id, sender_name, sender_address, sender_city, sender_state, sender_zip,
-                    artist_name, phone, address, qr_code, timestamp
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                entry['reference_id'],
-                entry['data']['sender']['name'],
-                entry['data']['sender']['address'],
-                entry['data']['sender']['city'],
-                entry['data']['sender']['state'],
-                entry['data']['sender']['zip'],
-                entry['data']['Artist Name'],
-                entry['data']['Phone'],
-                entry['data']['Address'],
-                entry['qr_code'],
-                entry['timestamp']
-            ))
+            self._insert_entry(c, entry)
             conn.commit()
             return True
         except Exception as e:
@@ -59,41 +357,250 @@ class DatabaseHandler:
         finally:
             conn.close()
 
-    def get_all_entries(self) -> list:
-        """Retrieve all QR code entries."""
+    @profiled('DatabaseHandler.update_entry')
+    def update_entry(self, entry: dict) -> bool:
+        """Replace the contents of an existing entry, keeping its reference ID."""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            c = conn.cursor()
+            updated = self._update_entry(c, entry)
+            conn.commit()
+            return updated
+        except Exception as e:
+            print(f"Error updating database entry: {e}")
+            return False
+        finally:
+            conn.close()
+
+    @profiled('DatabaseHandler.save_entries')
+    def save_entries(self, entries: list) -> dict:
+        """Save the results of process_upload_data in one transaction.
+
+        New entries are inserted, changed entries update their existing row
+        and unchanged entries are skipped. Returns counts per outcome.
+        """
+        counts = {'saved': 0, 'updated': 0, 'skipped': 0, 'failed': 0}
+        try:
+            conn = sqlite3.connect(self.db_path)
+            c = conn.cursor()
+            sender_ids = {}
+            for entry in entries:
+                status = entry.get('status', 'new')
+                try:
+                    if status == 'new':
+                        self._insert_entry(c, entry, sender_ids)
+                        counts['saved'] += 1
+                    elif status == 'changed':
+                        counts['updated' if self._update_entry(c, entry, sender_ids) else 'failed'] += 1
+                    else:
+                        counts['skipped'] += 1
+                except sqlite3.IntegrityError as e:
+                    print(f"Error saving entry {entry['reference_id']}: {e}")
+                    counts['failed'] += 1
+            conn.commit()
+            return counts
+        except Exception as e:
+            print(f"Error saving entries to database: {e}")
+            counts['failed'] = len(entries) - counts['skipped']
+            counts['saved'] = counts['updated'] = 0
+            return counts
+        finally:
+            conn.close()
+
+    @profiled('DatabaseHandler.import_entry_batches')
+    def import_entry_batches(self, batches, replace: bool = False) -> dict:
+        """Bulk-load raw rows in ENTRY_COLUMNS order, as yielded by ``iter_entry_batches``.
+
+        Rows whose reference ID or content hash is already stored are
+        skipped, so importing merges into the existing history. With
+        ``replace=True`` the table is emptied first, restoring it to exactly
+        the imported rows. Everything runs in one transaction.
+        """
+        counts = {'read': 0, 'inserted': 0, 'skipped': 0}
+        conn = sqlite3.connect(self.db_path)
+        try:
+            c = conn.cursor()
+            c.execute('BEGIN IMMEDIATE')
+            if replace:
+                c.execute('DELETE FROM qr_codes')
+            query = (f"INSERT OR IGNORE INTO qr_codes ({', '.join(QR_CODE_COLUMNS)}, artist_key) "
+                     f"VALUES ({', '.join('?' for _ in QR_CODE_COLUMNS)}, ?)")
+            sender_ids = {}
+            end = 1 + len(SENDER_COLUMNS)
+            for rows in batches:
+                for row in rows:
+                    if row[1:end] not in sender_ids:
+                        sender_ids[row[1:end]] = self._sender_id(c, dict(zip(SENDER_FIELDS, row[1:end])))
+                c.executemany(query, [(row[0], sender_ids[row[1:end]]) + tuple(row[end:]) + (artist_key(row[end]),)
+                                      for row in rows])
+                counts['read'] += len(rows)
+                # rowcount leaves out the qr_stats trigger writes that total_changes includes
+                counts['inserted'] += c.rowcount
+            counts['skipped'] = counts['read'] - counts['inserted']
+            conn.commit()
+            return counts
+        except Exception:
+            # Leave the history untouched if any batch fails
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    @profiled('DatabaseHandler.lookup_content_hashes')
+    def lookup_content_hashes(self, hashes: list) -> dict:
+        """Return existing entries keyed by content hash for the given hashes."""
+        found = {}
+        unique_hashes = list(dict.fromkeys(hashes))
         try:
             conn = sqlite3.connect(self.db_path)
             c = conn.cursor()
-            c.execute('SELECT * FROM qr_codes ORDER BY timestamp DESC')
-            rows = c.fetchall()
-            
-            entries = []
+            for start in range(0, len(unique_hashes), LOOKUP_CHUNK_SIZE):
+                chunk = unique_hashes[start:start + LOOKUP_CHUNK_SIZE]
+                placeholders = ', '.join('?' for _ in chunk)
+                c.execute(f'''
+                    SELECT content_hash, reference_id, qr_code, timestamp
+                    FROM qr_codes WHERE content_hash IN ({placeholders})
+                ''', chunk)
+                for row in c.fetchall():
+                    found[row[0]] = {
+                        'reference_id': row[1],
+                        'qr_code': row[2],
+                        'timestamp': row[3]
+                    }
+            return found
+        except Exception as e:
+            print(f"Error looking up content hashes: {e}")
+            return found
+        finally:
+            conn.close()
+
+    @profiled('DatabaseHandler.lookup_artists')
+    def lookup_artists(self, sender_name: str, artist_names: list, exclude_upload_id: str = None) -> dict:
+        """Return the newest reference ID per artist key for a sender.
+
+        Names are compared by ``artist_key``, so case and surrounding
+        whitespace differences between uploads still match. Rows written by
+        ``exclude_upload_id`` are ignored, so a job saving in chunks matches
+        against history as it was before the job started.
+        """
+        found = {}
+        unique_keys = list(dict.fromkeys(artist_key(name) for name in artist_names))
+        exclude, params = '', []
+        if exclude_upload_id is not None:
+            exclude, params = 'AND (upload_id IS NULL OR upload_id != ?)', [exclude_upload_id]
+        try:
+            conn = sqlite3.connect(self.db_path)
+            c = conn.cursor()
+            for start in range(0, len(unique_keys), LOOKUP_CHUNK_SIZE):
+                chunk = unique_keys[start:start + LOOKUP_CHUNK_SIZE]
+                placeholders = ', '.join('?' for _ in chunk)
+                c.execute(f'''
+                    SELECT artist_key, reference_id
+                    FROM qr_codes
+                    WHERE sender_id IN (SELECT sender_id FROM senders WHERE name = ?)
+                      AND artist_key IN ({placeholders})
+                      {exclude}
+                    ORDER BY timestamp ASC
+                ''', [sender_name] + chunk + params)
+                for row in c.fetchall():
+                    found[row[0]] = row[1]
+            return found
+        except Exception as e:
+            print(f"Error looking up artists: {e}")
+            return found
+        finally:
+            conn.close()
+
+    def iter_entry_batches(self, batch_size: int = 500, filters: dict = None, include_image: bool = True,
+                           newest_first: bool = False):
+        """Stream raw qr_codes rows in ENTRY_COLUMNS order as lists of up to ``batch_size`` tuples.
+
+        ``filters`` may contain any key of ENTRY_FILTERS. With
+        ``include_image=False`` the qr_code column is not read and is None
+        in every row. Rows come in insertion order unless ``newest_first``
+        is set.
+        """
+        columns = [column if column != 'qr_code' or include_image else 'NULL' for column in QR_CODE_COLUMNS]
+        conditions = []
+        params = []
+        for key, value in (filters or {}).items():
+            if key not in ENTRY_FILTERS:
+                raise ValueError(f"Unsupported filter: {key}")
+            conditions.append(ENTRY_FILTERS[key])
+            params.append(value)
+
+        query = f"SELECT {', '.join(columns)} FROM qr_codes"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY timestamp DESC" if newest_first else " ORDER BY rowid"
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            c = conn.cursor()
+            c.execute(query, params)
+            while True:
+                rows = c.fetchmany(batch_size)
+                if not rows:
+                    break
+                # Resolve sender_id to the profile columns from the cache; no join per row
+                yield [(row[0],) + self.get_sender(row[1]) + row[2:] for row in rows]
+        finally:
+            conn.close()
+
+    def iter_entries(self, batch_size: int = 500, filters: dict = None, include_image: bool = True,
+                     newest_first: bool = False):
+        """Stream QR code entries as EntryRecord tuples, one batch at a time.
+
+        Takes the same arguments as ``iter_entry_batches``.
+        """
+        for rows in self.iter_entry_batches(batch_size, filters, include_image, newest_first):
             for row in rows:
-                entry = {
-                    'reference_id': row[0],
-                    'data': {
-                        'sender': {
-                            'name': row[1],
-                            'address': row[2],
-                            'city': row[3],
-                            'state': row[4],
-                            'zip': row[5]
-                        },
-                        'Artist Name': row[6],
-                        'Phone': row[7] or '',
-                        'Address': row[8] or ''
-                    },
-                    'qr_code': row[9],
-                    'timestamp': row[10]
-                }
-                entries.append(entry)
-            return entries
+                yield EntryRecord._make(row)
+
+    @profiled('DatabaseHandler.get_all_entries')
+    def get_all_entries(self) -> list:
+        """Retrieve all QR code entries."""
+        try:
+            return [entry_from_record(record) for record in self.iter_entries(newest_first=True)]
         except Exception as e:
             print(f"Error retrieving entries: {e}")
             return []
+
+    def get_stats(self, days: int = 30, limit: int = 20) -> dict:
+        """Return code counts from the qr_stats aggregates.
+
+        Gives the total, counts for the most recent ``days`` days, and the
+        top ``limit`` senders and uploads. Reads only qr_stats, so the cost
+        does not grow with the number of stored codes.
+        """
+        stats = {'total': 0, 'by_day': [], 'by_sender': [], 'by_upload': []}
+        try:
+            conn = sqlite3.connect(self.db_path)
+            c = conn.cursor()
+            c.execute('SELECT COALESCE(SUM(codes), 0) FROM qr_stats')
+            stats['total'] = c.fetchone()[0]
+            c.execute('''
+                SELECT day, SUM(codes) FROM qr_stats GROUP BY day ORDER BY day DESC LIMIT ?
+            ''', (days,))
+            stats['by_day'] = list(reversed(c.fetchall()))
+            c.execute('''
+                SELECT sender_name, SUM(codes) AS total FROM qr_stats
+                GROUP BY sender_name ORDER BY total DESC LIMIT ?
+            ''', (limit,))
+            stats['by_sender'] = c.fetchall()
+            c.execute('''
+                SELECT upload_id, MIN(day), SUM(codes) FROM qr_stats WHERE upload_id != ''
+                GROUP BY upload_id ORDER BY upload_id DESC LIMIT ?
+            ''', (limit,))
+            stats['by_upload'] = c.fetchall()
+            return stats
+        except Exception as e:
+            print(f"Error reading statistics: {e}")
+            return stats
         finally:
             conn.close()
 
+    @profiled('DatabaseHandler.clear_all')
     def clear_all(self) -> bool:
         """Clear all entries from database."""
         try:
@@ -0,0 +1,127 @@
+import base64
+import os
+
+from src.core.db_handler import ENTRY_COLUMNS, png_bytes
+
+EXPORT_FORMATS = {'.parquet': 'parquet', '.arrow': 'arrow', '.feather': 'arrow', '.ipc': 'arrow'}
+EXPORT_BATCH_SIZE = 10000
+
+def export_format(path: str, fmt: str = None) -> str:
+    """Return 'parquet' or 'arrow' for an explicit format or the file extension."""
+    fmt = fmt or EXPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt not in ('parquet', 'arrow'):
+        raise ValueError(f"Cannot tell export format of {path}; use .parquet or .arrow")
+    return fmt
+
+def history_schema(include_image: bool = True):
+    """Arrow schema of an exported history file.
+
+    Images are stored as raw PNG bytes (see ``png_bytes``), and the column
+    is left out entirely when images are not exported.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for column in ENTRY_COLUMNS:
+        if column == 'qr_code':
+            if include_image:
+                fields.append(pa.field(column, pa.binary()))
+        else:
+            fields.append(pa.field(column, pa.string(), nullable=column not in ('reference_id', 'artist_name')))
+    return pa.schema(fields)
+
+def _record_batch(rows: list, schema):
+    """Build one Arrow record batch from raw ENTRY_COLUMNS rows."""
+    import pyarrow as pa
+
+    arrays = []
+    for index, column in enumerate(ENTRY_COLUMNS):
+        if column == 'qr_code':
+            if 'qr_code' in schema.names:
+                images = [png_bytes(row[index]) for row in rows]
+                # Arrow binary columns need bytes, so text that is not base64 is encoded
+                arrays.append(pa.array([image.encode('utf-8') if isinstance(image, str) else image
+                                        for image in images], pa.binary()))
+        else:
+            arrays.append(pa.array([None if row[index] is None else str(row[index]) for row in rows], pa.string()))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def export_history(db, path: str, fmt: str = None, include_image: bool = False, filters: dict = None,
+                   batch_size: int = EXPORT_BATCH_SIZE) -> int:
+    """Write qr_codes to a Parquet or Arrow IPC file and return the number of rows.
+
+    Rows are read from SQLite ``batch_size`` at a time and each batch is
+    written as its own Parquet row group or IPC record batch, so memory use
+    stays flat however large the history is. Arrow files are written
+    uncompressed so readers can memory-map them.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fmt = export_format(path, fmt)
+    schema = history_schema(include_image)
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(path, schema, compression='zstd')
+    else:
+        writer = pa.ipc.new_file(path, schema)
+
+    written = 0
+    try:
+        for rows in db.iter_entry_batches(batch_size, filters, include_image):
+            batch = _record_batch(rows, schema)
+            if fmt == 'parquet':
+                writer.write_table(pa.Table.from_batches([batch]), row_group_size=batch_size)
+            else:
+                writer.write_batch(batch)
+            written += len(rows)
+    finally:
+        writer.close()
+    return written
+
+def read_history_batches(path: str, fmt: str = None, batch_size: int = EXPORT_BATCH_SIZE):
+    """Yield Arrow record batches from an exported history file, memory-mapping Arrow files."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if export_format(path, fmt) == 'parquet':
+        yield from pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=batch_size)
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(path, 'r'))
+        for index in range(reader.num_record_batches):
+            yield reader.get_batch(index)
+
+def _entry_rows(batch) -> list:
+    """Convert a record batch back to raw ENTRY_COLUMNS rows for the database."""
+    columns = []
+    for column in ENTRY_COLUMNS:
+        if column in batch.schema.names:
+            values = batch.column(batch.schema.get_field_index(column)).to_pylist()
+            if column == 'qr_code':
+                values = [None if value is None else base64.b64encode(value).decode() for value in values]
+            columns.append(values)
+        else:
+            # Files from older exports may lack newer columns
+            columns.append([None] * batch.num_rows)
+    return list(zip(*columns))
+
+def import_history(db, path: str, fmt: str = None, replace: bool = False,
+                   batch_size: int = EXPORT_BATCH_SIZE) -> dict:
+    """Load an exported history file into the database.
+
+    Merges by default, skipping rows already stored; ``replace=True``
+    restores the table to exactly the file's rows. Only files exported
+    with images can be imported, since every entry needs its QR code.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fmt = export_format(path, fmt)
+    if fmt == 'parquet':
+        names = pq.read_schema(path).names
+    else:
+        names = pa.ipc.open_file(pa.memory_map(path, 'r')).schema.names
+    if 'qr_code' not in names:
+        raise ValueError(f"{path} was exported without images and cannot be imported")
+
+    batches = (_entry_rows(batch) for batch in read_history_batches(path, fmt, batch_size))
+    return db.import_entry_batches(batches, replace)
@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+
+# Crockford base32: no I, L, O or U, and sorts in the same order as the values it encodes
+ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+# Milliseconds are counted from 2024-01-01 UTC so 44 bits last well past 2500
+EPOCH_MS = 1704067200000
+TIMESTAMP_BITS = 44
+RANDOM_BITS = 20
+ID_LENGTH = 13  # 64 bits in base32
+
+class ReferenceIdGenerator:
+    """Generates short, time-ordered, collision-resistant reference IDs.
+
+    Each ID is a 44-bit millisecond timestamp followed by 20 bits that start
+    at a random value every millisecond and increment for further IDs in
+    the same millisecond (ULID-style monotonic ordering). IDs from one
+    process never collide and sort by creation time, so inserts append to
+    the end of the primary-key B-tree. The random start keeps IDs from
+    different processes apart.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def _next_parts(self):
+        with self._lock:
+            now_ms = int(time.time() * 1000) - EPOCH_MS
+            if now_ms <= self._last_ms:
+                # Same millisecond (or the clock stepped back): keep counting
+                now_ms = self._last_ms
+                self._sequence += 1
+                if self._sequence >= 1 << RANDOM_BITS:
+                    now_ms += 1
+                    self._sequence = int.from_bytes(os.urandom(3), 'big') >> 5
+            else:
+                # Leave headroom below the top so the counter rarely spills over
+                self._sequence = int.from_bytes(os.urandom(3), 'big') >> 5
+            self._last_ms = now_ms
+            return now_ms, self._sequence
+
+    def new_id(self) -> str:
+        """Return the next reference ID."""
+        timestamp, sequence = self._next_parts()
+        value = (timestamp << RANDOM_BITS) | sequence
+        chars = []
+        for _ in range(ID_LENGTH):
+            chars.append(ALPHABET[value & 31])
+            value >>= 5
+        return ''.join(reversed(chars))
+
+def id_timestamp(reference_id: str):
+    """Return the creation time (epoch seconds) of a generated ID, or None for legacy IDs."""
+    if len(reference_id) != ID_LENGTH or any(char not in ALPHABET for char in reference_id):
+        return None
+    value = 0
+    for char in reference_id:
+        value = value * 32 + ALPHABET.index(char)
+    return ((value >> RANDOM_BITS) + EPOCH_MS) / 1000
+
+_generator = ReferenceIdGenerator()
+
+def new_reference_id() -> str:
+    """Return a new time-ordered reference ID from the shared generator."""
+    return _generator.new_id()
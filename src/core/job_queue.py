@@ -0,0 +1,226 @@
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from io import StringIO
+
+import pandas as pd
+
+from src.core.id_generator import new_reference_id
+from src.core.qr_capacity import merge_plan_summaries, summarize_plans
+from src.core.qr_handler import process_upload_data
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed', 'cancelled')
+ACTIVE_STATUSES = ('queued', 'running')
+
+# Over-budget artist names kept per job for display
+OVER_BUDGET_NAME_LIMIT = 50
+
+JOB_COLUMNS = (
+    'job_id', 'filename', 'status', 'total_rows', 'rows_processed', 'new_rows', 'changed_rows',
+    'unchanged_rows', 'failed_rows', 'shortened_rows', 'over_budget_rows', 'plan_summary', 'error', 'cancel_requested', 'created_at', 'updated_at'
+)
+
+def _now() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+class JobQueue:
+    """Runs uploads on a background worker pool with their state kept in SQLite.
+
+    Each job stores its spreadsheet rows and sender so it survives a browser
+    refresh or a restart: unfinished jobs are resumed from the last saved
+    chunk when the queue starts. Rows are processed and saved ``chunk_size``
+    at a time, so results appear in history while the job runs and a cancel
+    request takes effect at the next chunk boundary.
+    """
+
+    def __init__(self, db, workers: int = 2, chunk_size: int = 50):
+        self.db = db
+        self.db_path = db.db_path
+        self.chunk_size = chunk_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='upload-job')
+        self._init_table()
+        self._resume_unfinished()
+
+    def _init_table(self):
+        """Initialize the upload_jobs table."""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS upload_jobs (
+                job_id TEXT PRIMARY KEY,
+                filename TEXT,
+                status TEXT NOT NULL,
+                total_rows INTEGER NOT NULL,
+                rows_processed INTEGER NOT NULL DEFAULT 0,
+                new_rows INTEGER NOT NULL DEFAULT 0,
+                changed_rows INTEGER NOT NULL DEFAULT 0,
+                unchanged_rows INTEGER NOT NULL DEFAULT 0,
+                failed_rows INTEGER NOT NULL DEFAULT 0,
+                shortened_rows INTEGER NOT NULL DEFAULT 0,
+                over_budget_rows INTEGER NOT NULL DEFAULT 0,
+                plan_summary TEXT,
+                error TEXT,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                created_at DATETIME,
+                updated_at DATETIME,
+                sender TEXT NOT NULL,
+                budget TEXT,
+                rows TEXT NOT NULL
+            )
+        ''')
+        c.execute('PRAGMA table_info(upload_jobs)')
+        columns = [row[1] for row in c.fetchall()]
+        if 'failed_rows' not in columns:
+            c.execute('ALTER TABLE upload_jobs ADD COLUMN failed_rows INTEGER NOT NULL DEFAULT 0')
+        if 'plan_summary' not in columns:
+            c.execute('ALTER TABLE upload_jobs ADD COLUMN plan_summary TEXT')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_upload_jobs_created ON upload_jobs (created_at)')
+        conn.commit()
+        conn.close()
+
+    def _update(self, job_id: str, **fields):
+        fields['updated_at'] = _now()
+        assignments = ', '.join(f"{key} = ?" for key in fields)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute(f'UPDATE upload_jobs SET {assignments} WHERE job_id = ?',
+                         list(fields.values()) + [job_id])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _resume_unfinished(self):
+        """Requeue jobs that were queued or running when the process stopped."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(
+                'SELECT job_id FROM upload_jobs WHERE status IN (?, ?) ORDER BY created_at',
+                ACTIVE_STATUSES
+            ).fetchall()
+        finally:
+            conn.close()
+        for (job_id,) in rows:
+            self._update(job_id, status='queued')
+            self._executor.submit(self._run, job_id)
+
+    def submit(self, df: pd.DataFrame, sender_settings: dict, budget: dict = None, filename: str = '') -> str:
+        """Queue an upload and return its job ID."""
+        job_id = new_reference_id()
+        now = _now()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('''
+                INSERT INTO upload_jobs (
+                    job_id, filename, status, total_rows, created_at, updated_at, sender, budget, rows
+                ) VALUES (?, ?, 'queued', ?, ?, ?, ?, ?, ?)
+            ''', (
+                job_id, filename, len(df), now, now,
+                json.dumps(sender_settings),
+                json.dumps(budget) if budget else None,
+                df.to_json(orient='split', date_format='iso')
+            ))
+            conn.commit()
+        finally:
+            conn.close()
+        self._executor.submit(self._run, job_id)
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """Ask a queued or running job to stop at its next chunk."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            c = conn.execute(
+                f"UPDATE upload_jobs SET cancel_requested = 1, updated_at = ? "
+                f"WHERE job_id = ? AND status IN ({', '.join('?' for _ in ACTIVE_STATUSES)})",
+                (_now(), job_id) + ACTIVE_STATUSES
+            )
+            conn.commit()
+            return c.rowcount > 0
+        finally:
+            conn.close()
+
+    def get_job(self, job_id: str):
+        """Return a job's state as a dict, or None.
+
+        'plan_summary' is the ``summarize_plans`` distribution of the codes
+        encoded so far plus 'over_budget_names', or None before any were.
+        """
+        jobs = self._select('WHERE job_id = ?', (job_id,))
+        return jobs[0] if jobs else None
+
+    def list_jobs(self, limit: int = 10) -> list:
+        """Return the most recent jobs, newest first."""
+        return self._select('ORDER BY created_at DESC, rowid DESC LIMIT ?', (limit,))
+
+    def _select(self, clause: str, params: tuple) -> list:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM upload_jobs {clause}", params).fetchall()
+            jobs = [dict(zip(JOB_COLUMNS, row)) for row in rows]
+            for job in jobs:
+                job['plan_summary'] = json.loads(job['plan_summary']) if job['plan_summary'] else None
+            return jobs
+        finally:
+            conn.close()
+
+    def _run(self, job_id: str):
+        """Process a job chunk by chunk, saving each chunk before the next."""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                row = conn.execute(
+                    'SELECT rows_processed, new_rows, changed_rows, unchanged_rows, failed_rows, shortened_rows, '
+                    'over_budget_rows, sender, budget, rows, plan_summary FROM upload_jobs WHERE job_id = ?', (job_id,)
+                ).fetchone()
+            finally:
+                conn.close()
+            if row is None:
+                return
+            counts = dict(zip(('rows_processed', 'new_rows', 'changed_rows', 'unchanged_rows', 'failed_rows',
+                               'shortened_rows', 'over_budget_rows'), row[:7]))
+            sender_settings = json.loads(row[7])
+            budget = json.loads(row[8]) if row[8] else None
+            df = pd.read_json(StringIO(row[9]), orient='split', dtype=False, convert_dates=False)
+            plan_summary = json.loads(row[10]) if row[10] else None
+            # JSON turns blank cells into None; restore the NaN that pandas readers give
+            df = df.astype(object).where(df.notna(), float('nan'))
+
+            self._update(job_id, status='running')
+            while counts['rows_processed'] < len(df):
+                if self.get_job(job_id)['cancel_requested']:
+                    self._update(job_id, status='cancelled')
+                    return
+
+                start = counts['rows_processed']
+                chunk = df.iloc[start:start + self.chunk_size]
+                # Earlier chunks of this job are excluded from artist matching
+                entries = process_upload_data(chunk, sender_settings, self.db, budget, job_id)
+                for entry in entries:
+                    entry['upload_id'] = job_id
+                saved = self.db.save_entries(entries)
+
+                counts['new_rows'] += saved['saved']
+                counts['changed_rows'] += saved['updated']
+                counts['unchanged_rows'] += saved['skipped']
+                counts['failed_rows'] += saved['failed']
+
+                # QR size budget report for the codes encoded in this chunk
+                plans = [entry['qr_plan'] for entry in entries if 'qr_plan' in entry]
+                if plans:
+                    chunk_summary = summarize_plans(plans)
+                    names = (plan_summary or {}).get('over_budget_names', [])
+                    names += [str(entry['data']['Artist Name']) for entry in entries
+                              if entry.get('qr_plan', {}).get('over_budget')]
+                    plan_summary = merge_plan_summaries(plan_summary, chunk_summary)
+                    plan_summary['over_budget_names'] = names[:OVER_BUDGET_NAME_LIMIT]
+                    counts['shortened_rows'] += chunk_summary['shortened']
+                    counts['over_budget_rows'] += chunk_summary['over_budget']
+                counts['rows_processed'] += len(chunk)
+                self._update(job_id, plan_summary=json.dumps(plan_summary) if plan_summary else None, **counts)
+
+            # Spreadsheet rows are no longer needed once the job is done
+            self._update(job_id, status='done', rows='[]')
+        except Exception as e:
+            print(f"Error running upload job {job_id}: {e}")
+            self._update(job_id, status='failed', error=str(e))
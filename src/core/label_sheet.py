@@ -0,0 +1,208 @@
+import base64
+import os
+import tempfile
+from io import BytesIO
+
+from PIL import Image, ImageDraw, ImageFont
+
+DPI = 300
+MM_PER_INCH = 25.4
+
+PAGE_SIZES = {
+    'letter': (8.5, 11.0),
+    'a4': (210 / MM_PER_INCH, 297 / MM_PER_INCH),
+}
+
+# Common label stock, all dimensions in inches
+LABEL_TEMPLATES = {
+    'letter-30': {  # Avery 5160
+        'page': 'letter', 'columns': 3, 'rows': 10,
+        'label_width': 2.625, 'label_height': 1.0,
+        'margin_left': 0.1875, 'margin_top': 0.5,
+        'gap_x': 0.125, 'gap_y': 0.0,
+    },
+    'letter-10': {  # Avery 5163
+        'page': 'letter', 'columns': 2, 'rows': 5,
+        'label_width': 4.0, 'label_height': 2.0,
+        'margin_left': 0.15625, 'margin_top': 0.5,
+        'gap_x': 0.1875, 'gap_y': 0.0,
+    },
+    'a4-21': {  # Avery L7160
+        'page': 'a4', 'columns': 3, 'rows': 7,
+        'label_width': 63.5 / MM_PER_INCH, 'label_height': 38.1 / MM_PER_INCH,
+        'margin_left': 7.2 / MM_PER_INCH, 'margin_top': 15.15 / MM_PER_INCH,
+        'gap_x': 2.5 / MM_PER_INCH, 'gap_y': 0.0,
+    },
+    'a4-14': {  # Avery L7163
+        'page': 'a4', 'columns': 2, 'rows': 7,
+        'label_width': 99.1 / MM_PER_INCH, 'label_height': 38.1 / MM_PER_INCH,
+        'margin_left': 4.65 / MM_PER_INCH, 'margin_top': 15.15 / MM_PER_INCH,
+        'gap_x': 2.5 / MM_PER_INCH, 'gap_y': 0.0,
+    },
+}
+
+def make_template(page: str = 'letter', columns: int = 3, rows: int = 10,
+                  margin_left: float = 0.25, margin_top: float = 0.5,
+                  gap_x: float = 0.125, gap_y: float = 0.0) -> dict:
+    """Build an evenly spaced custom grid for a page size (inches)."""
+    page_width, page_height = PAGE_SIZES[page]
+    label_width = (page_width - 2 * margin_left - gap_x * (columns - 1)) / columns
+    label_height = (page_height - 2 * margin_top - gap_y * (rows - 1)) / rows
+    return {
+        'page': page, 'columns': columns, 'rows': rows,
+        'label_width': label_width, 'label_height': label_height,
+        'margin_left': margin_left, 'margin_top': margin_top,
+        'gap_x': gap_x, 'gap_y': gap_y,
+    }
+
+def _px(inches: float) -> int:
+    return int(round(inches * DPI))
+
+def _load_font(size: int, bold: bool = False):
+    names = ['DejaVuSans-Bold.ttf', 'Arial Bold.ttf'] if bold else ['DejaVuSans.ttf', 'Arial.ttf']
+    for name in names:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+def _label_fields(entry):
+    """Return (qr_code, name, phone, address) from an entry dict or EntryRecord."""
+    if isinstance(entry, dict):
+        data = entry['data']
+        return entry['qr_code'], data['Artist Name'], data.get('Phone', ''), data.get('Address', '')
+    return entry.qr_code, entry.artist_name, entry.phone, entry.address
+
+def _clean(value) -> str:
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return str(value).strip()
+
+def _wrap(draw, text: str, font, width: int, max_lines: int) -> list:
+    """Greedy word wrap, truncating with an ellipsis past ``max_lines``."""
+    lines = []
+    current = ''
+    for word in text.split():
+        candidate = f"{current} {word}".strip()
+        if draw.textlength(candidate, font=font) <= width or not current:
+            current = candidate
+        else:
+            lines.append(current)
+            current = word
+    if current:
+        lines.append(current)
+    if len(lines) > max_lines:
+        lines = lines[:max_lines]
+        lines[-1] = lines[-1].rstrip(',. ') + '…'
+    return lines
+
+class LabelSheetComposer:
+    """Lays out QR labels onto label-sheet pages.
+
+    QR images are taken from the entries' stored base64 PNGs and scaled
+    with nearest-neighbour sampling, so nothing is re-encoded. Pages are
+    produced one at a time by ``pages`` as 1-bit images, which Pillow writes
+    losslessly (CCITT G4 in PDFs, 1-bit PNGs) instead of as grayscale JPEG.
+    """
+
+    def __init__(self, template: dict, padding: float = 0.06):
+        self.template = template
+        page_width, page_height = PAGE_SIZES[template['page']]
+        self.page_size = (_px(page_width), _px(page_height))
+        self.label_size = (_px(template['label_width']), _px(template['label_height']))
+        self.padding = _px(padding)
+
+        label_height = self.label_size[1] - 2 * self.padding
+        self.qr_size = label_height
+        self.name_font = _load_font(max(label_height // 7, 12), bold=True)
+        self.body_font = _load_font(max(label_height // 9, 10))
+
+    @property
+    def labels_per_page(self) -> int:
+        return self.template['columns'] * self.template['rows']
+
+    def _origin(self, slot: int):
+        t = self.template
+        column = slot % t['columns']
+        row = slot // t['columns']
+        x = _px(t['margin_left'] + column * (t['label_width'] + t['gap_x']))
+        y = _px(t['margin_top'] + row * (t['label_height'] + t['gap_y']))
+        return x, y
+
+    def _draw_label(self, page, draw, slot: int, entry):
+        qr_code, name, phone, address = _label_fields(entry)
+        x, y = self._origin(slot)
+        x += self.padding
+        y += self.padding
+
+        if qr_code:
+            with Image.open(BytesIO(base64.b64decode(qr_code))) as qr_image:
+                qr_image = qr_image.convert('L').resize((self.qr_size, self.qr_size), Image.NEAREST)
+                page.paste(qr_image, (x, y))
+
+        text_x = x + self.qr_size + self.padding
+        text_width = self.label_size[0] - self.qr_size - 3 * self.padding
+        line_height = int(getattr(self.body_font, 'size', 10) * 1.2)
+
+        draw.text((text_x, y), _clean(name)[:60], font=self.name_font, fill='black')
+        text_y = y + int(getattr(self.name_font, 'size', 12) * 1.4)
+        if _clean(phone):
+            draw.text((text_x, text_y), _clean(phone), font=self.body_font, fill='black')
+            text_y += line_height
+        max_lines = max((y + self.qr_size - text_y) // line_height, 1)
+        for line in _wrap(draw, _clean(address), self.body_font, text_width, max_lines):
+            draw.text((text_x, text_y), line, font=self.body_font, fill='black')
+            text_y += line_height
+
+    def pages(self, entries):
+        """Yield one 1-bit PIL page per ``labels_per_page`` entries."""
+        page = None
+        draw = None
+        slot = 0
+        for entry in entries:
+            if page is None:
+                page = Image.new('L', self.page_size, 'white')
+                draw = ImageDraw.Draw(page)
+            self._draw_label(page, draw, slot, entry)
+            slot += 1
+            if slot == self.labels_per_page:
+                yield self._bilevel(page)
+                page = None
+                slot = 0
+        if page is not None:
+            yield self._bilevel(page)
+
+    @staticmethod
+    def _bilevel(page):
+        # Threshold rather than dither so QR modules and text edges stay crisp
+        return page.convert('1', dither=Image.NONE)
+
+    def write_pdf(self, entries, path: str) -> int:
+        """Write a multi-page PDF, appending one page at a time."""
+        count = 0
+        for page in self.pages(entries):
+            page.save(path, 'PDF', resolution=DPI, append=count > 0)
+            count += 1
+        return count
+
+    def pdf_bytes(self, entries) -> bytes:
+        """Render a PDF through a temporary file and return its contents."""
+        fd, path = tempfile.mkstemp(suffix='.pdf')
+        os.close(fd)
+        try:
+            self.write_pdf(entries, path)
+            with open(path, 'rb') as f:
+                return f.read()
+        finally:
+            os.remove(path)
+
+    def write_pngs(self, entries, directory: str, prefix: str = 'labels') -> list:
+        """Write each page as a numbered PNG and return the paths."""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for number, page in enumerate(self.pages(entries), start=1):
+            path = os.path.join(directory, f"{prefix}_{number:03d}.png")
+            page.save(path, 'PNG', dpi=(DPI, DPI))
+            paths.append(path)
+        return paths
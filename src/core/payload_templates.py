@@ -0,0 +1,44 @@
+from functools import lru_cache
+
+SENDER_FIELDS = ('name', 'address', 'city', 'state', 'zip')
+DEFAULT_PROFILE = 'default'
+
+class PayloadTemplate:
+    """QR payload layout with the sender header rendered once."""
+
+    def __init__(self, sender_name, sender_address, sender_city, sender_state, sender_zip):
+        self.header = (
+            f"SR:\nNM: {sender_name}\nADD: {sender_address}\n"
+            f"CT: {sender_city}\nSTT: {sender_state}\n"
+            f"CD: {sender_zip}\n\nAT:\nNM: "
+        )
+
+    def render(self, name, phone='', address='') -> str:
+        """Fill the artist slots and return the full payload."""
+        return f"{self.header}{name}\nPH: {phone}\nADD: {address}"
+
+@lru_cache(maxsize=64)
+def _compile(sender_values: tuple) -> PayloadTemplate:
+    return PayloadTemplate(*sender_values)
+
+def compile_template(sender_info: dict) -> PayloadTemplate:
+    """Return the cached compiled template for a sender."""
+    return _compile(tuple(sender_info[field] for field in SENDER_FIELDS))
+
+def get_sender_profiles(settings: dict) -> dict:
+    """Return named sender profiles, with the main sender as 'default'.
+
+    A profile in ``sender_profiles`` that is itself named 'default' is
+    listed as 'default (profile)' so it cannot replace the main sender.
+    """
+    profiles = {}
+    if settings and settings.get('sender'):
+        profiles[DEFAULT_PROFILE] = settings['sender']
+    for name, sender in (settings or {}).get('sender_profiles', {}).items():
+        if not all(sender.get(field) for field in SENDER_FIELDS):
+            continue
+        if name == DEFAULT_PROFILE:
+            print(f"Sender profile '{name}' clashes with the main sender; listing it as '{name} (profile)'")
+            name = f"{name} (profile)"
+        profiles[name] = sender
+    return profiles
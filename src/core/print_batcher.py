@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class PrintBatcher:
+    """Collects print items and flushes them together.
+
+    A batch is handed to ``flush_fn`` when it reaches ``max_items``, when
+    ``window`` seconds have passed since its first item, or when no new
+    item has arrived for ``idle`` seconds (the operator paused).
+
+    ``flush_fn`` returns whether the batch printed. A failed batch is put
+    back at the front of the queue and retried after ``retry_delay``
+    seconds; items that fail ``max_attempts`` times are dropped and counted.
+    """
+
+    def __init__(self, flush_fn, max_items: int = 10, window: float = 5.0, idle: float = 2.0,
+                 max_attempts: int = 3, retry_delay: float = 5.0):
+        self.flush_fn = flush_fn
+        self.max_items = max_items
+        self.window = window
+        self.idle = idle
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        # [item, failed attempts] pairs, oldest first
+        self._items = []
+        self._first_at = None
+        self._last_at = None
+        self._retry_at = None
+        self._counts = {'printed_batches': 0, 'failed_batches': 0, 'printed_items': 0, 'dropped_items': 0}
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def add(self, item):
+        """Add an item, starting the flush thread on first use."""
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="print-batcher", daemon=True)
+                self._thread.start()
+            now = time.monotonic()
+            if not self._items:
+                self._first_at = now
+            self._items.append([item, 0])
+            self._last_at = now
+            self._condition.notify()
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._items)
+
+    def stats(self) -> dict:
+        """Return printed/failed batch counts and items dropped after repeated failures."""
+        with self._condition:
+            return dict(self._counts, pending=len(self._items))
+
+    def _take_due(self):
+        """Return the batch if it is due, otherwise the seconds until it will be."""
+        if not self._items:
+            return None, None
+        now = time.monotonic()
+        if self._retry_at is not None and now < self._retry_at:
+            return None, self._retry_at - now
+        if len(self._items) >= self.max_items:
+            wait = 0
+        else:
+            wait = min(self._first_at + self.window, self._last_at + self.idle) - now
+        if wait > 0:
+            return None, wait
+        batch = self._items[:self.max_items]
+        self._items = self._items[self.max_items:]
+        self._first_at = self._last_at = time.monotonic() if self._items else None
+        return batch, None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                batch, wait = self._take_due()
+                while batch is None:
+                    self._condition.wait(wait)
+                    batch, wait = self._take_due()
+            self._print(batch)
+
+    def _print(self, batch) -> bool:
+        """Hand a batch to ``flush_fn``, requeueing it if it fails."""
+        try:
+            ok = bool(self.flush_fn([item for item, _ in batch]))
+        except Exception as e:
+            logger.error(f"Error flushing print batch: {str(e)}")
+            ok = False
+        with self._condition:
+            if ok:
+                self._counts['printed_batches'] += 1
+                self._counts['printed_items'] += len(batch)
+                self._retry_at = None
+                return True
+            self._counts['failed_batches'] += 1
+            retry = []
+            for entry in batch:
+                entry[1] += 1
+                if entry[1] < self.max_attempts:
+                    retry.append(entry)
+            dropped = len(batch) - len(retry)
+            if dropped:
+                self._counts['dropped_items'] += dropped
+                logger.error(f"Dropped {dropped} print items after {self.max_attempts} failed attempts")
+            if retry:
+                now = time.monotonic()
+                self._items = retry + self._items
+                self._first_at = self._last_at = now
+                self._retry_at = now + self.retry_delay
+                logger.warning(f"Print batch failed; retrying {len(retry)} items in {self.retry_delay} s")
+                self._condition.notify()
+        return False
+
+    def flush(self) -> bool:
+        """Print everything collected so far immediately."""
+        with self._condition:
+            batch = self._items
+            self._items = []
+            self._first_at = self._last_at = self._retry_at = None
+        if batch:
+            return self._print(batch)
+        return True
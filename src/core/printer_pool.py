@@ -0,0 +1,285 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Neiko/Beeprt PL70e-BT vendor/product ID from system_profiler output
+DEFAULT_PRINTER_IDS = [(0x09c6, 0x0426)]
+DEFAULT_IN_EP = 0x81
+DEFAULT_OUT_EP = 0x03
+
+def _parse_id(value):
+    """Accept vendor/product IDs as ints or hex strings like '0x09c6'."""
+    if isinstance(value, str):
+        return int(value, 16) if value.lower().startswith('0x') else int(value)
+    return value
+
+def _detect_endpoints(device):
+    """Return the (in_ep, out_ep) pair of a USB device's first interface."""
+    try:
+        cfg = device.get_active_configuration()
+        interface = cfg[(0, 0)]
+        in_ep = None
+        out_ep = None
+        for ep in interface:
+            if ep.bEndpointAddress & 0x80:  # IN endpoint
+                in_ep = ep.bEndpointAddress
+            else:  # OUT endpoint
+                out_ep = ep.bEndpointAddress
+        logger.info(f"Detected endpoints - IN: {in_ep}, OUT: {out_ep}")
+        return (in_ep if in_ep is not None else DEFAULT_IN_EP,
+                out_ep if out_ep is not None else DEFAULT_OUT_EP)
+    except Exception as ep_error:
+        logger.warning(f"Could not detect endpoints automatically: {str(ep_error)}")
+        logger.info("Using default endpoints")
+        return DEFAULT_IN_EP, DEFAULT_OUT_EP
+
+class PrinterDevice:
+    """A single ESC/POS USB printer plus its health and throughput counters."""
+
+    def __init__(self, vendor_id, product_id, in_ep=DEFAULT_IN_EP, out_ep=DEFAULT_OUT_EP,
+                 bus=None, address=None, name=None):
+        self.vendor_id = _parse_id(vendor_id)
+        self.product_id = _parse_id(product_id)
+        self.in_ep = _parse_id(in_ep)
+        self.out_ep = _parse_id(out_ep)
+        self.bus = bus
+        self.address = address
+        self.name = name or (
+            f"{self.vendor_id:04x}:{self.product_id:04x}"
+            + (f"@{bus}-{address}" if bus is not None and address is not None else "")
+        )
+
+        self.healthy = True
+        self.busy = 0
+        self.jobs = 0
+        self.failures = 0
+        self.total_time = 0.0
+        self.last_error = None
+        self.retry_at = 0.0
+        self.created_at = time.time()
+
+    @classmethod
+    def from_config(cls, config: dict):
+        """Build a device from a settings.json 'printers' entry."""
+        return cls(
+            config['vendor_id'],
+            config['product_id'],
+            config.get('in_ep', DEFAULT_IN_EP),
+            config.get('out_ep', DEFAULT_OUT_EP),
+            config.get('bus'),
+            config.get('address'),
+            config.get('name')
+        )
+
+    def connect(self):
+        """Open an escpos connection to this device."""
+        from escpos import printer as escpos_printer
+
+        if self.bus is not None and self.address is not None:
+            # Several identical printers: pin the connection to one USB port
+            return escpos_printer.Usb(
+                self.vendor_id,
+                self.product_id,
+                usb_args={'bus': self.bus, 'address': self.address},
+                in_ep=self.in_ep,
+                out_ep=self.out_ep
+            )
+        return escpos_printer.Usb(
+            self.vendor_id,
+            self.product_id,
+            0,  # USB interface number (usually 0)
+            self.in_ep,
+            self.out_ep
+        )
+
+    def probe(self):
+        """Open the device and release it again, raising if it cannot be reached."""
+        p = self.connect()
+        try:
+            # python-escpos 3.x only opens USB on first use; reading .device forces it
+            if p.device is None:
+                raise IOError(f"Printer {self.name} could not be opened")
+        finally:
+            try:
+                p.close()
+            except Exception:
+                pass
+
+    def info(self) -> dict:
+        """Return connection details for logging."""
+        return {
+            'name': self.name,
+            'vendor_id': self.vendor_id,
+            'product_id': self.product_id,
+            'in_ep': self.in_ep,
+            'out_ep': self.out_ep,
+            'bus': self.bus,
+            'address': self.address
+        }
+
+    def stats(self) -> dict:
+        """Return health and throughput counters."""
+        uptime = max(time.time() - self.created_at, 1e-9)
+        return {
+            'name': self.name,
+            'healthy': self.healthy,
+            'busy': self.busy,
+            'jobs': self.jobs,
+            'failures': self.failures,
+            'avg_print_ms': round(self.total_time / self.jobs * 1000, 1) if self.jobs else None,
+            'jobs_per_minute': round(self.jobs / uptime * 60, 2),
+            'last_error': self.last_error
+        }
+
+class PrinterPool:
+    """Sends print jobs to the least-busy healthy printer.
+
+    A device that fails a job is taken out of rotation and retried after
+    ``retry_interval`` seconds, either by the health checker or by being
+    offered the next job once its retry time has passed.
+    """
+
+    def __init__(self, devices=None, retry_interval: float = 30.0):
+        self.devices = list(devices or [])
+        self.retry_interval = retry_interval
+        self._lock = threading.Lock()
+        self._health_thread = None
+
+    def add(self, device: PrinterDevice):
+        with self._lock:
+            self.devices.append(device)
+
+    def available(self) -> bool:
+        """Return True if any printer is in rotation or due for a retry."""
+        now = time.time()
+        with self._lock:
+            return any(d.healthy or d.retry_at <= now for d in self.devices)
+
+    def acquire(self):
+        """Reserve the least-busy usable printer, or return None."""
+        now = time.time()
+        with self._lock:
+            candidates = [d for d in self.devices if d.healthy or d.retry_at <= now]
+            if not candidates:
+                return None
+            # Prefer healthy devices, then fewest active jobs, then fewest completed jobs
+            device = min(candidates, key=lambda d: (not d.healthy, d.busy, d.jobs))
+            device.busy += 1
+            return device
+
+    def release(self, device: PrinterDevice, success: bool, elapsed: float, error=None):
+        with self._lock:
+            device.busy -= 1
+            if success:
+                device.jobs += 1
+                device.total_time += elapsed
+                if not device.healthy:
+                    logger.info(f"Printer {device.name} recovered, returning it to rotation")
+                device.healthy = True
+                device.last_error = None
+            else:
+                device.failures += 1
+                device.healthy = False
+                device.last_error = str(error) if error else None
+                device.retry_at = time.time() + self.retry_interval
+                logger.warning(f"Printer {device.name} taken out of rotation: {error}")
+
+    def release_unused(self, device: PrinterDevice):
+        """Give back a reservation without recording a job."""
+        with self._lock:
+            device.busy -= 1
+
+    def run(self, job) -> bool:
+        """Run ``job(printer)`` on a pooled printer, failing over once per device."""
+        tried = set()
+        while True:
+            device = self.acquire()
+            if device is None or device in tried:
+                if device is not None:
+                    self.release_unused(device)
+                return False
+            tried.add(device)
+
+            start = time.perf_counter()
+            p = None
+            try:
+                p = device.connect()
+                job(p)
+                self.release(device, True, time.perf_counter() - start)
+                return True
+            except Exception as e:
+                logger.error(f"Error printing on {device.name}: {str(e)}")
+                self.release(device, False, time.perf_counter() - start, e)
+                if p is not None and hasattr(p, 'discard'):
+                    p.discard()
+            finally:
+                if p is not None and hasattr(p, 'close'):
+                    try:
+                        p.close()
+                    except Exception:
+                        pass
+
+    def check_health(self):
+        """Try to reconnect to printers that are out of rotation."""
+        for device in list(self.devices):
+            if device.healthy or device.busy:
+                continue
+            try:
+                device.probe()
+                with self._lock:
+                    device.healthy = True
+                    device.last_error = None
+                logger.info(f"Printer {device.name} is reachable again")
+            except Exception as e:
+                with self._lock:
+                    device.last_error = str(e)
+                    device.retry_at = time.time() + self.retry_interval
+
+    def start_health_checks(self):
+        """Start a daemon thread that periodically re-checks failed printers."""
+        if self._health_thread is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(self.retry_interval)
+                self.check_health()
+
+        self._health_thread = threading.Thread(target=loop, name="printer-health", daemon=True)
+        self._health_thread.start()
+
+    def stats(self) -> list:
+        with self._lock:
+            return [d.stats() for d in self.devices]
+
+def discover_usb_printers(printer_ids=None) -> list:
+    """Find every attached USB device matching one of the (vendor, product) IDs."""
+    import usb.core
+    import usb.backend.libusb1
+
+    backend = usb.backend.libusb1.get_backend()
+    if backend is None:
+        logger.error("No USB backend available. Make sure libusb is installed.")
+        return []
+
+    devices = []
+    for vendor_id, product_id in (printer_ids or DEFAULT_PRINTER_IDS):
+        vendor_id = _parse_id(vendor_id)
+        product_id = _parse_id(product_id)
+        for usb_device in usb.core.find(find_all=True, idVendor=vendor_id, idProduct=product_id,
+                                        backend=backend):
+            in_ep, out_ep = _detect_endpoints(usb_device)
+            device = PrinterDevice(vendor_id, product_id, in_ep, out_ep,
+                                   getattr(usb_device, 'bus', None), getattr(usb_device, 'address', None))
+            logger.info(f"Found printer {device.name}")
+            devices.append(device)
+
+    if not devices:
+        # List all USB devices for debugging
+        logger.info("Available USB devices:")
+        for dev in usb.core.find(find_all=True, backend=backend):
+            logger.info(f"  Vendor ID: 0x{dev.idVendor:04x}, Product ID: 0x{dev.idProduct:04x}")
+
+    return devices
@@ -0,0 +1,116 @@
+from collections import Counter
+
+import qrcode
+from qrcode.exceptions import DataOverflowError
+
+# Error-correction levels from most to least redundant
+EC_LEVELS = {
+    'H': qrcode.constants.ERROR_CORRECT_H,
+    'Q': qrcode.constants.ERROR_CORRECT_Q,
+    'M': qrcode.constants.ERROR_CORRECT_M,
+    'L': qrcode.constants.ERROR_CORRECT_L,
+}
+EC_ORDER = ['H', 'Q', 'M', 'L']
+
+DEFAULT_BUDGET = {
+    'max_version': 40,
+    'error_correction': 'M',
+    'shorten': False,
+    # Printer width limit; both must be set for it to apply
+    'width_dots': None,
+    'dots_per_module': None,
+}
+
+def modules_for_version(version: int) -> int:
+    """Return the side length of a QR symbol in modules."""
+    return 17 + 4 * version
+
+def max_version_for_width(width_dots: int, dots_per_module: int, border: int = 4) -> int:
+    """Largest version that prints at ``dots_per_module`` within ``width_dots``.
+
+    A 58 mm thermal printer has 384 printable dots; at 3 dots per module
+    that allows version 25.
+    """
+    modules = width_dots // dots_per_module - 2 * border
+    return max(min((modules - 17) // 4, 40), 0)
+
+def fit_version(data: str, level: str):
+    """Return the smallest version holding ``data`` at ``level``, or None if it overflows."""
+    qr = qrcode.QRCode(error_correction=EC_LEVELS[level])
+    qr.add_data(data)
+    try:
+        return qr.best_fit()
+    except DataOverflowError:
+        return None
+
+def plan_qr(data: str, budget: dict = None) -> dict:
+    """Choose the error-correction level and version for a payload before encoding.
+
+    The budget's preferred level is used when it fits ``max_version``;
+    otherwise lower levels are tried in turn. The plan is marked
+    ``over_budget`` if even level L does not fit. When ``width_dots`` and
+    ``dots_per_module`` are set, ``max_version`` is capped to what fits
+    the printer width.
+    """
+    budget = {**DEFAULT_BUDGET, **(budget or {})}
+    max_version = budget['max_version']
+    if budget['width_dots'] and budget['dots_per_module']:
+        max_version = min(max_version, max_version_for_width(budget['width_dots'], budget['dots_per_module']))
+    preferred = budget['error_correction']
+
+    for level in EC_ORDER[EC_ORDER.index(preferred):]:
+        version = fit_version(data, level)
+        if version is not None and version <= max_version:
+            return {'version': version, 'error_correction': level, 'over_budget': False}
+
+    version = fit_version(data, 'L')
+    return {'version': version, 'error_correction': 'L', 'over_budget': True}
+
+def shorten_to_budget(build_payload, address: str, budget: dict = None):
+    """Drop trailing words from ``address`` until ``build_payload(address)`` fits the budget.
+
+    Returns (address, payload, plan). If nothing fits, the last attempt
+    (empty address) is returned with its over-budget plan.
+    """
+    words = address.split(' ')
+    while True:
+        candidate = ' '.join(words).rstrip(', ')
+        payload = build_payload(candidate)
+        plan = plan_qr(payload, budget)
+        if not plan['over_budget'] or not words:
+            return candidate, payload, plan
+        words.pop()
+
+def summarize_plans(plans: list) -> dict:
+    """Per-upload distribution of versions and error-correction levels."""
+    versions = Counter(plan['version'] for plan in plans if plan['version'] is not None)
+    return {
+        'codes': len(plans),
+        'versions': dict(sorted(versions.items())),
+        'max_version': max(versions) if versions else None,
+        'error_correction': dict(Counter(plan['error_correction'] for plan in plans)),
+        'over_budget': sum(1 for plan in plans if plan['over_budget']),
+        'shortened': sum(1 for plan in plans if plan.get('shortened')),
+    }
+
+def merge_plan_summaries(total: dict, summary: dict) -> dict:
+    """Add ``summary`` into a running ``summarize_plans`` total.
+
+    Either may have been through JSON, so version keys are normalized
+    back to integers.
+    """
+    if not total:
+        total = {'codes': 0, 'versions': {}, 'max_version': None, 'error_correction': {},
+                 'over_budget': 0, 'shortened': 0}
+    versions = Counter({int(version): count for version, count in total['versions'].items()})
+    versions.update({int(version): count for version, count in summary['versions'].items()})
+    error_correction = Counter(total['error_correction'])
+    error_correction.update(summary['error_correction'])
+    return {
+        'codes': total['codes'] + summary['codes'],
+        'versions': dict(sorted(versions.items())),
+        'max_version': max(versions) if versions else None,
+        'error_correction': dict(error_correction),
+        'over_budget': total['over_budget'] + summary['over_budget'],
+        'shortened': total['shortened'] + summary['shortened'],
+    }
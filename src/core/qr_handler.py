@@ -1,20 +1,28 @@
 import qrcode
 import base64
 from io import BytesIO
-import uuid
 import pandas as pd
 from datetime import datetime
 
-def generate_qr_code(data: str) -> str:
-    """Generate a QR code for given data and return as base64 string."""
+from src.core.content_hash import artist_key, compute_content_hash
+from src.core.id_generator import new_reference_id
+from src.core.payload_templates import compile_template
+from src.core.qr_capacity import EC_LEVELS, plan_qr, shorten_to_budget
+from src.utils.profiling import profiled
+
+def generate_qr_code(data: str, error_correction: str = 'M', version: int = None) -> str:
+    """Generate a QR code for given data and return as base64 string.
+
+    Pass the version from ``plan_qr`` to skip fitting it again.
+    """
     qr = qrcode.QRCode(
-        version=None,  # Let it auto-determine size based on data
-        error_correction=qrcode.constants.ERROR_CORRECT_M,  # Medium error correction
+        version=version,  # None lets it auto-determine size based on data
+        error_correction=EC_LEVELS[error_correction],  # Medium error correction by default
         box_size=10,
         border=4,
     )
     qr.add_data(data)
-    qr.make(fit=True)
+    qr.make(fit=version is None)
 
     img = qr.make_image(fill_color="black", back_color="white")
     buffered = BytesIO()
@@ -25,14 +33,26 @@ def generate_download_link(img_base64: str, filename: str) -> str:
     """Generate HTML download link for QR code image."""
     return f'<a href="data:image/png;base64,{img_base64}" download="{filename}">Download QR</a>'
 
-def process_upload_data(df: pd.DataFrame, sender_settings: dict) -> list:
-    """Process uploaded data and generate QR codes."""
-    entries = []
+@profiled('process_upload_data')
+def process_upload_data(df: pd.DataFrame, sender_settings: dict, db=None, budget: dict = None,
+                        upload_id: str = None) -> list:
+    """Process uploaded data and generate QR codes.
+
+    When a database handler is given, rows whose payload is already stored are
+    linked to the existing entry instead of being re-encoded, and rows for a
+    known artist whose details changed keep that artist's reference ID. Each
+    entry carries a 'status' of 'new', 'unchanged' or 'changed'. Rows already
+    saved under ``upload_id`` do not count as known artists, so an upload
+    processed in chunks never overwrites its own earlier rows.
+
+    Encoded entries also carry a 'qr_plan' from ``plan_qr`` for the given
+    QR ``budget``; over-budget rows have their address shortened when the
+    budget allows it.
+    """
+    rows = []
+    template = compile_template(sender_settings)
     
     for index, row in df.iterrows():
-        # Generate reference ID
-        ref_id = str(uuid.uuid4())[:8]
-        
         # Combine address fields
         address_parts = []
         address_fields = ['Address: Address Line 1', 'Address: Address Line 2', 'Address: City',
@@ -43,40 +63,94 @@ def process_upload_data(df: pd.DataFrame, sender_settings: dict) -> list:
                 address_parts.append(str(row[field]).strip())
         
         combined_address = ', '.join(address_parts)
+        artist_name = row['Artist Name']
+        phone = row.get('Phone', '')
+        content_hash = compute_content_hash(sender_settings, artist_name, phone, combined_address)
+        rows.append((artist_name, phone, combined_address, content_hash))
+
+    # Match rows against history before doing any QR encoding
+    existing = {}
+    known_artists = {}
+    if db is not None:
+        existing = db.lookup_content_hashes([row[3] for row in rows])
+        known_artists = db.lookup_artists(sender_settings['name'], [row[0] for row in rows], upload_id)
+    linked_refs = {match['reference_id'] for match in existing.values()}
 
-        # Generate QR content
-        qr_content = create_qr_content(
-            sender_settings,
-            {
-                'name': row['Artist Name'],
-                'phone': row.get('Phone', ''),
-                'address': combined_address
-            }
-        )
+    entries = []
+    seen = {}
+    
+    for artist_name, phone, combined_address, content_hash in rows:
+        data = {
+            'sender': sender_settings,
+            'Artist Name': artist_name,
+            'Phone': phone,
+            'Address': combined_address
+        }
+
+        # Same payload earlier in this upload or already stored
+        match = seen.get(content_hash) or existing.get(content_hash)
+        if match is not None:
+            entries.append({
+                'reference_id': match['reference_id'],
+                'data': data,
+                'qr_code': match['qr_code'],
+                'timestamp': match['timestamp'],
+                'content_hash': content_hash,
+                'status': 'unchanged'
+            })
+            continue
+
+        # Known artist with different details keeps the old reference ID
+        ref_id = known_artists.get(artist_key(artist_name))
+        if ref_id is not None and ref_id not in linked_refs:
+            status = 'changed'
+            linked_refs.add(ref_id)
+        else:
+            # Generate a time-ordered reference ID
+            ref_id = new_reference_id()
+            status = 'new'
+
+        # Generate QR content and plan its size before encoding
+        qr_content = template.render(artist_name, phone, combined_address)
+        qr_plan = plan_qr(qr_content, budget)
+        if qr_plan['over_budget'] and (budget or {}).get('shorten'):
+            combined_address, qr_content, qr_plan = shorten_to_budget(
+                lambda address: template.render(artist_name, phone, address),
+                combined_address,
+                budget
+            )
+            data['Address'] = combined_address
+            qr_plan['shortened'] = True
         
-        qr_code = generate_qr_code(qr_content)
+        qr_code = generate_qr_code(qr_content, qr_plan['error_correction'], qr_plan['version'])
         
         entry = {
             'reference_id': ref_id,
-            'data': {
-                'sender': sender_settings,
-                'Artist Name': row['Artist Name'],
-                'Phone': row.get('Phone', ''),
-                'Address': combined_address
-            },
+            'data': data,
             'qr_code': qr_code,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'content_hash': content_hash,
+            'status': status,
+            'qr_plan': qr_plan
         }
         
+        seen[content_hash] = entry
         entries.append(entry)
     
     return entries
 
+def summarize_upload(entries: list) -> dict:
+    """Count processed entries by status."""
+    summary = {'new': 0, 'unchanged': 0, 'changed': 0}
+    for entry in entries:
+        status = entry.get('status', 'new')
+        summary[status] = summary.get(status, 0) + 1
+    return summary
+
 def create_qr_content(sender_info: dict, artist_info: dict) -> str:
     """Create QR code content string from sender and artist information."""
-    return (
-        f"SR:\nNM: {sender_info['name']}\nADD: {sender_info['address']}\n"
-        f"CT: {sender_info['city']}\nSTT: {sender_info['state']}\n"
-        f"CD: {sender_info['zip']}\n\nAT:\nNM: {artist_info['name']}\n"
-        f"PH: {artist_info.get('phone', '')}\nADD: {artist_info.get('address', '')}"
+    return compile_template(sender_info).render(
+        artist_info['name'],
+        artist_info.get('phone', ''),
+        artist_info.get('address', '')
     )
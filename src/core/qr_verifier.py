@@ -0,0 +1,172 @@
+import base64
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from io import BytesIO
+
+from src.core.db_handler import EntryRecord, entry_from_record
+from src.core.payload_templates import compile_template
+from src.core.qr_parser import QRDataParser
+
+VERIFY_CHUNK_SIZE = 25
+
+def available_decoders() -> list:
+    """Return the decoders that can be imported here, in the order they are tried."""
+    decoders = []
+    try:
+        from pyzbar import pyzbar  # noqa: F401
+        decoders.append('pyzbar')
+    except Exception:
+        # pyzbar also fails to import when the zbar shared library is missing
+        pass
+    try:
+        import cv2  # noqa: F401
+        decoders.append('opencv')
+    except ImportError:
+        pass
+    return decoders
+
+def decode_qr_image(png_bytes: bytes, decoders: list):
+    """Decode a QR image, returning (text, decoder name) or (None, None)."""
+    from PIL import Image
+
+    image = Image.open(BytesIO(png_bytes)).convert('L')
+    for decoder in decoders:
+        if decoder == 'pyzbar':
+            from pyzbar import pyzbar
+            results = pyzbar.decode(image)
+            if results:
+                return results[0].data.decode('utf-8', errors='replace'), decoder
+        elif decoder == 'opencv':
+            import cv2
+            import numpy as np
+            text, points, _ = cv2.QRCodeDetector().detectAndDecode(np.array(image))
+            if text:
+                return text, decoder
+    return None, None
+
+def _normalize(parsed: dict) -> dict:
+    """Blank spreadsheet cells are rendered as 'nan' but stored as NULL; treat both as empty."""
+    return {
+        section: {key: ('' if value in ('nan', 'None') else value) for key, value in fields.items() if value}
+        for section, fields in parsed.items()
+    }
+
+def _mismatched_fields(expected: dict, decoded: dict) -> list:
+    fields = []
+    for section in ('sender', 'artist'):
+        want = expected.get(section, {})
+        got = decoded.get(section, {})
+        for key in sorted(set(want) | set(got)):
+            if want.get(key, '') != got.get(key, ''):
+                fields.append(f"{section}.{key}")
+    return fields
+
+def verify_items(items: list, decoders: list) -> list:
+    """Decode each (reference_id, payload, qr_code) and compare it with its payload.
+
+    Runs in the worker processes, so it only takes and returns plain data.
+    """
+    results = []
+    for reference_id, payload, qr_code in items:
+        result = {'reference_id': reference_id, 'ok': False, 'decoder': None, 'decode_ms': None, 'error': None}
+        try:
+            png_bytes = qr_code if isinstance(qr_code, bytes) else base64.b64decode(qr_code, validate=True)
+            start = time.perf_counter()
+            text, decoder = decode_qr_image(png_bytes, decoders)
+            result['decode_ms'] = (time.perf_counter() - start) * 1000
+            result['decoder'] = decoder
+            if text is None:
+                result['error'] = 'not decodable'
+            else:
+                mismatched = _mismatched_fields(_normalize(QRDataParser.parse_data(payload)),
+                                                _normalize(QRDataParser.parse_data(text)))
+                if mismatched:
+                    result['error'] = f"decoded data differs in {', '.join(mismatched)}"
+                else:
+                    result['ok'] = True
+        except Exception as e:
+            result['error'] = f"invalid image: {e}"
+        results.append(result)
+    return results
+
+def verification_item(entry) -> tuple:
+    """Return the (reference_id, payload, qr_code) to verify for an entry or history record."""
+    if isinstance(entry, EntryRecord):
+        entry = entry_from_record(entry)
+    data = entry['data']
+    payload = compile_template(data['sender']).render(
+        data['Artist Name'],
+        data.get('Phone') if data.get('Phone') is not None else '',
+        data.get('Address') if data.get('Address') is not None else ''
+    )
+    return entry['reference_id'], payload, entry['qr_code']
+
+def _percentile(sorted_values: list, pct: float):
+    if not sorted_values:
+        return None
+    index = min(int(len(sorted_values) * pct / 100), len(sorted_values) - 1)
+    return round(sorted_values[index], 2)
+
+def verify_entries(entries, workers: int = None, chunk_size: int = VERIFY_CHUNK_SIZE, progress=None) -> dict:
+    """Decode every entry's QR code across a process pool and report failures.
+
+    ``entries`` may be entry dicts from ``process_upload_data`` or records
+    from ``DatabaseHandler.iter_entries``; it is consumed lazily with only a
+    few chunks in flight, so whole-database runs stay within memory.
+    ``progress`` is called with the number checked after each chunk.
+    """
+    decoders = available_decoders()
+    if not decoders:
+        raise RuntimeError("No QR decoder available; install pyzbar (with zbar) or opencv-python-headless")
+
+    workers = workers or os.cpu_count() or 1
+    results = []
+    start = time.perf_counter()
+
+    def chunks():
+        chunk = []
+        for entry in entries:
+            chunk.append(verification_item(entry))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in chunks():
+            pending.add(executor.submit(verify_items, chunk, decoders))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results.extend(future.result())
+                if progress:
+                    progress(len(results))
+        for future in pending:
+            results.extend(future.result())
+        if progress:
+            progress(len(results))
+
+    timings = sorted(result['decode_ms'] for result in results if result['decode_ms'] is not None)
+    decoder_counts = {}
+    for result in results:
+        if result['decoder']:
+            decoder_counts[result['decoder']] = decoder_counts.get(result['decoder'], 0) + 1
+
+    return {
+        'checked': len(results),
+        'passed': sum(1 for result in results if result['ok']),
+        'failures': [result for result in results if not result['ok']],
+        'decoders': decoder_counts,
+        'decode_ms': {
+            'p50': _percentile(timings, 50),
+            'p90': _percentile(timings, 90),
+            'p99': _percentile(timings, 99),
+            'max': round(timings[-1], 2) if timings else None,
+            'mean': round(sum(timings) / len(timings), 2) if timings else None
+        },
+        'seconds': round(time.perf_counter() - start, 2),
+        'workers': workers
+    }
@@ -0,0 +1,170 @@
+import io
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from escpos.escpos import Escpos
+
+from src.core.printer_pool import PrinterDevice
+
+logger = logging.getLogger(__name__)
+
+class VirtualPrinter(Escpos):
+    """ESC/POS printer that captures the byte stream instead of writing to USB.
+
+    Each ``_raw`` call sleeps for ``latency`` seconds plus the time the payload
+    would take at ``bytes_per_second``, and fails with probability
+    ``error_rate``. A finished job is handed to ``on_close`` in one piece so
+    concurrent jobs never interleave in the capture; a job that was
+    ``discard``ed after a failure, or wrote nothing, is not captured.
+    """
+
+    def __init__(self, on_close, latency: float = 0.0, bytes_per_second=None,
+                 error_rate: float = 0.0, rng=None, **kwargs):
+        Escpos.__init__(self, **kwargs)
+        self._buffer = io.BytesIO()
+        self._on_close = on_close
+        self.discarded = False
+        self.latency = latency
+        self.bytes_per_second = bytes_per_second
+        self.error_rate = error_rate
+        self.rng = rng or random.Random()
+
+    def _raw(self, msg):
+        if self.error_rate and self.rng.random() < self.error_rate:
+            raise IOError("Simulated USB transfer error")
+        delay = self.latency
+        if self.bytes_per_second:
+            delay += len(msg) / self.bytes_per_second
+        if delay:
+            time.sleep(delay)
+        self._buffer.write(msg)
+
+    def discard(self):
+        """Drop what the current job wrote; called by PrinterPool.run when the job fails."""
+        self._buffer = io.BytesIO()
+        self.discarded = True
+
+    def close(self):
+        if self._on_close is not None:
+            data = self._buffer.getvalue()
+            if data or self.discarded:
+                self._on_close(data, not self.discarded)
+            self._on_close = None
+
+class VirtualPrinterDevice(PrinterDevice):
+    """Pool device backed by a VirtualPrinter.
+
+    Captured jobs are kept in memory, or appended to ``output_path`` when one
+    is given. Setting ``offline`` makes new connections fail until it is
+    cleared, which exercises the pool's take-out/recover path.
+    """
+
+    def __init__(self, name: str, latency: float = 0.0, bytes_per_second=None,
+                 error_rate: float = 0.0, connect_error_rate: float = 0.0,
+                 output_path=None, seed=None):
+        PrinterDevice.__init__(self, 0, 0, name=name)
+        self.latency = latency
+        self.bytes_per_second = bytes_per_second
+        self.error_rate = error_rate
+        self.connect_error_rate = connect_error_rate
+        self.output_path = output_path
+        self.offline = False
+        self.captured = []
+        self.bytes_written = 0
+        self.failed_jobs = 0
+        self._rng = random.Random(seed)
+        self._capture_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict, index: int = 0):
+        """Build a device from a settings.json 'printers.virtual' entry."""
+        output_path = config.get('output')
+        if output_path and config.get('count', 1) > 1:
+            output_path = f"{output_path}.{index}"
+        return cls(
+            config.get('name', 'virtual') + f"-{index}",
+            config.get('latency_ms', 0) / 1000,
+            config.get('bytes_per_second'),
+            config.get('error_rate', 0.0),
+            config.get('connect_error_rate', 0.0),
+            output_path,
+            config.get('seed')
+        )
+
+    def connect(self):
+        if self.offline:
+            raise IOError(f"Virtual printer {self.name} is offline")
+        if self.connect_error_rate and self._rng.random() < self.connect_error_rate:
+            raise IOError(f"Simulated connection failure on {self.name}")
+        return VirtualPrinter(
+            self._capture,
+            self.latency,
+            self.bytes_per_second,
+            self.error_rate,
+            random.Random(self._rng.random())
+        )
+
+    def probe(self):
+        """Fail while offline; a probe never produces a capture."""
+        if self.offline:
+            raise IOError(f"Virtual printer {self.name} is offline")
+
+    def _capture(self, data: bytes, ok: bool = True):
+        with self._capture_lock:
+            if not ok:
+                self.failed_jobs += 1
+                return
+            self.bytes_written += len(data)
+            if self.output_path:
+                with open(self.output_path, 'ab') as f:
+                    f.write(data)
+            else:
+                self.captured.append(data)
+
+    def info(self) -> dict:
+        return {
+            'name': self.name,
+            'backend': 'virtual',
+            'latency_ms': round(self.latency * 1000, 1),
+            'error_rate': self.error_rate,
+            'failed_jobs': self.failed_jobs,
+            'output': self.output_path
+        }
+
+def create_virtual_devices(config: dict) -> list:
+    """Create the virtual printers described by a 'printers.virtual' config."""
+    return [VirtualPrinterDevice.from_config(config, index) for index in range(config.get('count', 1))]
+
+def run_print_benchmark(print_fn, payloads: list, concurrency: int = 1) -> dict:
+    """Call ``print_fn`` for every payload and report prints per second."""
+    latencies = []
+    failures = 0
+    lock = threading.Lock()
+
+    def one(payload):
+        nonlocal failures
+        start = time.perf_counter()
+        ok = print_fn(payload)
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                failures += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, payloads))
+    total = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'jobs': len(payloads),
+        'failures': failures,
+        'seconds': round(total, 3),
+        'prints_per_second': round((len(payloads) - failures) / total, 2) if total else None,
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+        'max_ms': round(latencies[-1] * 1000, 2) if latencies else None
+    }
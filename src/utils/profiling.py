@@ -0,0 +1,126 @@
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = {
+    'enabled': False,
+    'threshold_ms': 500,
+    'top_n': 15,
+    'output_dir': 'profiles',
+    'trace_memory': True,
+}
+
+def load_profiling_config(path: str = 'settings.json') -> dict:
+    """Read profiling options from settings.json, overridden by QR_PROFILE* env vars."""
+    config = dict(DEFAULT_CONFIG)
+    try:
+        with open(path, 'r') as f:
+            config.update(json.load(f).get('profiling', {}))
+    except Exception:
+        pass
+    if 'QR_PROFILE' in os.environ:
+        config['enabled'] = os.environ['QR_PROFILE'].lower() in ('1', 'true', 'yes', 'on')
+    if 'QR_PROFILE_THRESHOLD_MS' in os.environ:
+        config['threshold_ms'] = float(os.environ['QR_PROFILE_THRESHOLD_MS'])
+    return config
+
+# Read once at import: when disabled, profiled() hands back the undecorated function
+PROFILING = load_profiling_config()
+
+_state = threading.local()
+_trace_lock = threading.Lock()
+_trace_users = 0
+
+def _start_tracing():
+    """Start tracemalloc for the first concurrent profiled call."""
+    global _trace_users
+    with _trace_lock:
+        if _trace_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _trace_users += 1
+
+def _stop_tracing():
+    """Stop tracemalloc once the last concurrent profiled call finishes."""
+    global _trace_users
+    with _trace_lock:
+        _trace_users -= 1
+        if _trace_users == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+def _report(name: str, profiler: cProfile.Profile, elapsed_ms: float, snapshot):
+    """Dump the profile and log a top-N summary for a slow call."""
+    top_n = PROFILING['top_n']
+    os.makedirs(PROFILING['output_dir'], exist_ok=True)
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(PROFILING['output_dir'], f"{name}-{stamp}-{threading.get_ident()}.prof")
+    profiler.dump_stats(path)
+
+    buffer = io.StringIO()
+    pstats.Stats(profiler, stream=buffer).sort_stats('cumulative').print_stats(top_n)
+    summary = [f"Slow call {name}: {elapsed_ms:.0f} ms (profile saved to {path})", buffer.getvalue()]
+
+    if snapshot is not None:
+        summary.append(f"Top {top_n} allocations:")
+        for stat in snapshot.statistics('lineno')[:top_n]:
+            summary.append(f"  {stat}")
+
+    logger.warning("\n".join(summary))
+
+def profiled(name: str = None):
+    """Profile calls slower than the configured threshold.
+
+    Returns the function unchanged unless profiling was enabled when the
+    module was imported, so there is no overhead while it is off. Nested
+    profiled calls in the same thread are covered by the outermost one.
+    """
+    def decorator(func):
+        if not PROFILING['enabled']:
+            return func
+
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_state, 'active', False):
+                return func(*args, **kwargs)
+
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another thread's profiler is active (Python 3.12+); run unprofiled
+                return func(*args, **kwargs)
+
+            _state.active = True
+            trace_memory = PROFILING['trace_memory']
+            if trace_memory:
+                _start_tracing()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.disable()
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                snapshot = None
+                if trace_memory:
+                    if elapsed_ms >= PROFILING['threshold_ms']:
+                        snapshot = tracemalloc.take_snapshot()
+                    _stop_tracing()
+                _state.active = False
+                if elapsed_ms >= PROFILING['threshold_ms']:
+                    try:
+                        _report(label, profiler, elapsed_ms, snapshot)
+                    except Exception as e:
+                        logger.error(f"Error writing profile for {label}: {e}")
+
+        return wrapper
+    return decorator
@@ -0,0 +1,60 @@
+import hashlib
+import os
+
+# Hashed asset URLs never change content, so browsers may cache them for a year
+ASSET_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Logical asset name -> path relative to the static directory. Vendor files are
+# committed (jsQR 1.4.0 is dist/jsQR.js from the npm package), never fetched at runtime.
+ASSETS = {
+    'scanner.css': 'scanner.css',
+    'scanner.js': 'scanner.js',
+    'jsQR.min.js': 'vendor/jsQR.min.js',
+}
+
+class AssetManifest:
+    """Maps logical asset names to content-hashed filenames.
+
+    ``url('scanner.js')`` returns ``/assets/scanner.<hash>.js``; the hash
+    changes whenever the file does, so the URL can be cached forever. Every
+    asset, including the vendored jsQR, is served from the static directory;
+    nothing is loaded from a CDN.
+    """
+
+    def __init__(self, static_dir: str, url_prefix: str = '/assets/'):
+        self.static_dir = static_dir
+        self.url_prefix = url_prefix
+        self.hashed_names = {}
+        self.paths = {}
+        self.build()
+
+    def build(self):
+        """Hash every asset currently on disk."""
+        self.hashed_names = {}
+        self.paths = {}
+        for name, relative_path in ASSETS.items():
+            path = os.path.join(self.static_dir, relative_path)
+            if not os.path.exists(path):
+                continue
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()[:12]
+            stem, ext = os.path.splitext(name)
+            hashed_name = f"{stem}.{digest}{ext}"
+            self.hashed_names[name] = hashed_name
+            self.paths[hashed_name] = path
+
+    def url(self, name: str) -> str:
+        """Return the URL to reference an asset from a template."""
+        if name in self.hashed_names:
+            return self.url_prefix + self.hashed_names[name]
+        if name in ASSETS:
+            raise KeyError(f"Static asset {name} is missing from {os.path.join(self.static_dir, ASSETS[name])}")
+        raise KeyError(f"Unknown static asset: {name}")
+
+    def missing(self) -> list:
+        """Return the names of assets that are not on disk."""
+        return [name for name in ASSETS if name not in self.hashed_names]
+
+    def resolve(self, hashed_name: str):
+        """Return the file path for a hashed asset name, or None."""
+        return self.paths.get(hashed_name)
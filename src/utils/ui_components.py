@@ -113,14 +113,13 @@ def show_settings_interface(current_settings, save_callback):
         if submit:
             # Validate all fields are filled
             if all([sender_name, sender_address, sender_city, sender_state, sender_zip]):
-                new_settings = {
-                    "sender": {
-                        "name": sender_name,
-                        "address": sender_address,
-                        "city": sender_city,
-                        "state": sender_state,
-                        "zip": sender_zip
-                    }
+                new_settings = dict(current_settings)
+                new_settings["sender"] = {
+                    "name": sender_name,
+                    "address": sender_address,
+                    "city": sender_city,
+                    "state": sender_state,
+                    "zip": sender_zip
                 }
                 save_callback(new_settings)
                 st.success("Settings saved successfully!")
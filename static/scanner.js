@@ -0,0 +1,289 @@
+// DOM elements
+const video = document.getElementById('qr-video');
+const canvas = document.getElementById('qr-canvas');
+const ctx = canvas.getContext('2d');
+const statusMessage = document.getElementById('status-message');
+const qrResult = document.getElementById('qr-result');
+const capturedImage = document.getElementById('captured-image');
+const rescanButton = document.getElementById('rescan-button');
+const reprintButton = document.getElementById('reprint-button');
+const continuousButton = document.getElementById('continuous-button');
+const batchResults = document.getElementById('batch-results');
+
+// Scanner state
+let scanning = false;
+let scanInterval = null;
+let videoStream = null;
+let lastScannedData = null;
+
+// Continuous mode state
+const BATCH_SIZE = 10;        // Send as soon as this many codes are waiting
+const BATCH_DELAY_MS = 500;   // ...or after this long without a new code
+let continuousMode = false;
+let seenCodes = new Set();
+let pendingCodes = [];
+let flushTimer = null;
+
+// Initialize camera on page load
+document.addEventListener('DOMContentLoaded', startCamera);
+
+// Start the camera
+function startCamera() {
+    statusMessage.textContent = "Requesting camera access...";
+
+    // Get user's camera
+    navigator.mediaDevices.getUserMedia({ 
+        video: { 
+            facingMode: "environment",
+            width: { ideal: 640 },
+            height: { ideal: 480 }
+        } 
+    })
+    .then(stream => {
+        videoStream = stream;
+        video.srcObject = stream;
+
+        // Wait for video to be ready
+        video.onloadedmetadata = () => {
+            video.play();
+
+            // Set canvas size to match video
+            canvas.width = video.videoWidth;
+            canvas.height = video.videoHeight;
+
+            // Start scanning
+            startScanning();
+        };
+    })
+    .catch(err => {
+        statusMessage.textContent = `Camera error: ${err.message}`;
+        console.error("Camera error:", err);
+    });
+}
+
+// Start QR code scanning
+function startScanning() {
+    if (scanning) return;
+
+    scanning = true;
+    statusMessage.textContent = "Scanning for QR code...";
+    video.style.display = 'block';
+    capturedImage.style.display = 'none';
+    qrResult.style.display = 'none';
+    rescanButton.style.display = 'none';
+    reprintButton.style.display = 'none';
+
+    // Process video frames
+    scanInterval = setInterval(scanVideoFrame, 100); // 10 frames per second
+}
+
+// Process a video frame to detect QR codes
+function scanVideoFrame() {
+    if (!scanning) return;
+
+    // Draw current video frame to canvas
+    ctx.drawImage(video, 0, 0, canvas.width, canvas.height);
+
+    // Get image data for processing
+    const imageData = ctx.getImageData(0, 0, canvas.width, canvas.height);
+
+    // Look for QR code in the image
+    const code = jsQR(imageData.data, imageData.width, imageData.height, {
+        inversionAttempts: "dontInvert"
+    });
+
+    if (code && continuousMode) {
+        // Keep scanning; only queue codes not seen this session
+        if (!seenCodes.has(code.data)) {
+            seenCodes.add(code.data);
+            queueCode(code.data);
+            highlightQR(code.location);
+        }
+        return;
+    }
+
+    if (code) {
+        // QR code found!
+        console.log("QR code detected:", code.data);
+
+        // Stop scanning
+        stopScanning();
+
+        // Highlight the QR code on canvas
+        highlightQR(code.location);
+
+        // Display the captured image
+        capturedImage.src = canvas.toDataURL('image/jpeg');
+        capturedImage.style.display = 'block';
+        video.style.display = 'none';
+
+        // Process QR code data
+        processQRData(code.data);
+    }
+}
+
+// Stop scanning
+function stopScanning() {
+    scanning = false;
+    clearInterval(scanInterval);
+    statusMessage.textContent = "QR Code detected!";
+    rescanButton.style.display = 'block';
+}
+
+// Highlight the detected QR code
+function highlightQR(location) {
+    // Draw the video frame again
+    ctx.drawImage(video, 0, 0, canvas.width, canvas.height);
+
+    // Draw QR code boundary
+    ctx.beginPath();
+    ctx.moveTo(location.topLeftCorner.x, location.topLeftCorner.y);
+    ctx.lineTo(location.topRightCorner.x, location.topRightCorner.y);
+    ctx.lineTo(location.bottomRightCorner.x, location.bottomRightCorner.y);
+    ctx.lineTo(location.bottomLeftCorner.x, location.bottomLeftCorner.y);
+    ctx.lineTo(location.topLeftCorner.x, location.topLeftCorner.y);
+    ctx.lineWidth = 4;
+    ctx.strokeStyle = '#00e676';
+    ctx.stroke();
+
+    // Add timestamp
+    const now = new Date();
+    const timestamp = now.toLocaleString();
+    ctx.font = '16px "Segoe UI", sans-serif';
+    ctx.fillStyle = '#00e676';
+    ctx.fillText(`Scanned: ${timestamp}`, 10, 30);
+}
+
+// Process QR code data with the backend
+function processQRData(data) {
+    lastScannedData = data;
+    fetch('/process_qr', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ qr_data: data }),
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            // Display formatted result
+            qrResult.textContent = result.formatted_result;
+            qrResult.style.display = 'block';
+            if (result.printer_available) {
+                reprintButton.style.display = 'block';
+            }
+        } else {
+            qrResult.textContent = `Error: ${result.error}`;
+            qrResult.style.display = 'block';
+        }
+    })
+    .catch(error => {
+        console.error('Error processing QR data:', error);
+        qrResult.textContent = `Failed to process QR code: ${error.message}`;
+        qrResult.style.display = 'block';
+    });
+}
+
+// Print the last scanned payload back as a QR code for a damaged label
+function reprintQR() {
+    if (!lastScannedData) return;
+    statusMessage.textContent = "Printing replacement QR code...";
+
+    fetch('/reprint_qr', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ qr_data: lastScannedData }),
+    })
+    .then(response => response.json())
+    .then(result => {
+        statusMessage.textContent = result.print_success
+            ? "Replacement QR code printed"
+            : "Could not print replacement QR code";
+    })
+    .catch(error => {
+        console.error('Error printing replacement QR:', error);
+        statusMessage.textContent = `Failed to print replacement QR code: ${error.message}`;
+    });
+}
+
+// Add a newly seen code to the pending batch
+function queueCode(data) {
+    const item = document.createElement('div');
+    item.className = 'batch-item pending';
+    item.textContent = 'Processing...';
+    batchResults.prepend(item);
+    batchResults.style.display = 'block';
+
+    pendingCodes.push({ data, item });
+    statusMessage.textContent = `Continuous scanning: ${seenCodes.size} codes scanned`;
+
+    clearTimeout(flushTimer);
+    if (pendingCodes.length >= BATCH_SIZE) {
+        flushCodes();
+    } else {
+        flushTimer = setTimeout(flushCodes, BATCH_DELAY_MS);
+    }
+}
+
+// Send pending codes to the backend in one request
+function flushCodes() {
+    if (pendingCodes.length === 0) return;
+    const batch = pendingCodes;
+    pendingCodes = [];
+
+    fetch('/process_qr_batch', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ qr_data: batch.map(entry => entry.data) }),
+    })
+    .then(response => response.json())
+    .then(result => {
+        batch.forEach((entry, index) => {
+            const itemResult = result.results ? result.results[index] : null;
+            entry.item.classList.remove('pending');
+            entry.item.textContent = itemResult ? itemResult.formatted_result : `Error: ${result.error}`;
+        });
+    })
+    .catch(error => {
+        console.error('Error processing QR batch:', error);
+        batch.forEach(entry => {
+            // Allow the code to be picked up again on the next sweep
+            seenCodes.delete(entry.data);
+            entry.item.textContent = `Failed to process QR code: ${error.message}`;
+        });
+    });
+}
+
+// Toggle continuous mode
+function toggleContinuous() {
+    continuousMode = !continuousMode;
+    continuousButton.textContent = `Continuous Mode: ${continuousMode ? 'On' : 'Off'}`;
+    continuousButton.classList.toggle('active', continuousMode);
+
+    if (continuousMode) {
+        seenCodes = new Set();
+        batchResults.innerHTML = '';
+        startScanning();
+        statusMessage.textContent = "Continuous scanning: sweep codes past the camera";
+    } else {
+        flushCodes();
+        statusMessage.textContent = "Scanning for QR code...";
+    }
+}
+
+// Rescan button handler
+rescanButton.addEventListener('click', startScanning);
+reprintButton.addEventListener('click', reprintQR);
+continuousButton.addEventListener('click', toggleContinuous);
+
+// Clean up resources when page is unloaded
+window.addEventListener('beforeunload', () => {
+    if (videoStream) {
+        videoStream.getTracks().forEach(track => track.stop());
+    }
+});
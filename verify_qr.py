@@ -0,0 +1,45 @@
+import argparse
+import json
+import sys
+
+from src.core.db_handler import DatabaseHandler
+from src.core.qr_verifier import VERIFY_CHUNK_SIZE, verify_entries
+
+def main():
+    """Decode every stored QR code and check it round-trips to its payload."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--db', default='qrcodes.db', help="database to verify")
+    parser.add_argument('--workers', type=int, default=None, help="decoder processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=VERIFY_CHUNK_SIZE, help="codes per worker task")
+    parser.add_argument('--since', help="only codes generated at or after this timestamp")
+    parser.add_argument('--upload-id', help="only codes from this upload job")
+    parser.add_argument('--json', action='store_true', help="print the full report as JSON")
+    args = parser.parse_args()
+
+    db = DatabaseHandler(args.db)
+    filters = {key: value for key, value in (('since', args.since), ('upload_id', args.upload_id)) if value}
+
+    def progress(checked):
+        if not args.json:
+            print(f"\r  checked {checked}", end='', file=sys.stderr, flush=True)
+
+    report = verify_entries(db.iter_entries(filters=filters), args.workers, args.chunk_size, progress)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(file=sys.stderr)
+        print(f"{report['passed']}/{report['checked']} codes round-trip in {report['seconds']} s "
+              f"with {report['workers']} workers")
+        timings = report['decode_ms']
+        if timings['p50'] is not None:
+            print(f"  decode ms : p50 {timings['p50']}  p90 {timings['p90']}  p99 {timings['p99']}  "
+                  f"max {timings['max']}  mean {timings['mean']}")
+        print(f"  decoders  : {report['decoders']}")
+        for failure in report['failures']:
+            print(f"  FAIL {failure['reference_id']}: {failure['error']}")
+
+    sys.exit(1 if report['failures'] else 0)
+
+if __name__ == '__main__':
+    main()